@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmark - relevance and latency harness for core.search
+Usage: python benchmark.py                     # Evaluate, compare with benchmark_baseline.json
+       python benchmark.py --update-baseline   # Accept current rankings as the new baseline
+       python benchmark.py --sweep             # Grid of BM25 k1/b values, mean nDCG@3 each
+       python benchmark.py --json              # Machine-readable report
+
+Relevance: every labeled query lists the rows that should come back, by the
+row's name column. Reported per domain/stack: nDCG@3, recall@3 and, for
+domains, whether detect_domain() routes the query there.
+
+Latency: index build time per CSV, warm search()/search_stack() percentiles,
+search_batch() throughput and design-system generation, plus peak memory
+while building every index.
+
+Exit code 1 when any query's nDCG@3 or recall@3, or any routing decision,
+is worse than in the baseline. Latency is only gated with --max-slowdown.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from math import log2
+from pathlib import Path
+
+from core import (CSV_CONFIG, STACK_CONFIG, _STACK_COLS, DATA_DIR, BM25, _load_csv, _build_index,
+                  detect_domain, search, search_stack, search_batch)
+
+BASELINE_FILE = Path(__file__).parent / "benchmark_baseline.json"
+K = 3
+LATENCY_ROUNDS = 20
+
+# Column naming each row, used by the labels
+NAME_COLS = {
+    "style": "Style Category",
+    "prompt": "Style Category",
+    "color": "Product Type",
+    "chart": "Data Type",
+    "landing": "Pattern Name",
+    "product": "Product Type",
+    "ux": "Issue",
+    "typography": "Font Pairing Name",
+    "icons": "Icon Name",
+    "react": "Issue",
+    "web": "Issue",
+}
+STACK_NAME_COL = "Guideline"
+
+# ============ LABELED QUERIES ============
+# query -> relevant row names; the first listed is the best answer
+DOMAIN_QUERIES = {
+    "style": {
+        "glassmorphism frosted glass cards": ["Glassmorphism", "Liquid Glass"],
+        "dark mode oled": ["Dark Mode (OLED)"],
+        "brutalism raw bold": ["Brutalism", "Neubrutalism"],
+        "minimalism clean whitespace": ["Minimalism & Swiss Style", "Exaggerated Minimalism", "Minimal & Direct"],
+        "financial dashboard data": ["Financial Dashboard", "Data-Dense Dashboard", "Executive Dashboard"],
+        "bento grid layout": ["Bento Box Grid"],
+        "glasmorphism": ["Glassmorphism", "Liquid Glass"],
+        "fintech ui": ["Financial Dashboard", "Trust & Authority"],
+    },
+    "prompt": {
+        "neumorphism soft shadows": ["Neumorphism", "Soft UI Evolution"],
+        "pixel art retro game": ["Pixel Art"],
+        "sci-fi hud interface": ["HUD / Sci-Fi FUI"],
+        "claymorphism playful": ["Claymorphism"],
+    },
+    "color": {
+        "fintech crypto palette": ["Fintech/Crypto"],
+        "healthcare calm colors": ["Healthcare App", "Mental Health App"],
+        "luxury ecommerce": ["E-commerce Luxury", "Luxury/Premium Brand"],
+        "restaurant food": ["Restaurant/Food Service"],
+        "banking finance trust": ["Banking/Traditional Finance", "Financial Dashboard", "Fintech/Crypto"],
+    },
+    "chart": {
+        "trend over time line": ["Trend Over Time", "Time-Series Forecast"],
+        "compare categories bar": ["Compare Categories"],
+        "part to whole pie": ["Part-to-Whole", "Proportional/Percentage"],
+        "stock trading candlestick": ["Stock/Trading OHLC"],
+        "conversion funnel": ["Funnel/Flow"],
+    },
+    "landing": {
+        "pricing page plans": ["Pricing Page + CTA", "Pricing-Focused Landing"],
+        "waitlist coming soon": ["Waitlist/Coming Soon"],
+        "hero testimonials social proof": ["Hero + Testimonials + CTA"],
+        "webinar registration": ["Webinar Registration"],
+        "video hero": ["Video-First Hero"],
+    },
+    "product": {
+        "fintech investment app": ["Fintech/Crypto", "Banking/Traditional Finance", "Financial Dashboard"],
+        "saas dashboard": ["SaaS (General)", "Analytics Dashboard"],
+        "online course learning": ["Online Course/E-learning", "Educational App"],
+        "real estate listings": ["Real Estate/Property"],
+        "fitness gym workout": ["Fitness/Gym App"],
+        "dashbord analytics": ["Analytics Dashboard", "Financial Dashboard"],
+    },
+    "ux": {
+        "touch target size mobile": ["Touch Target Size", "Touch Spacing"],
+        "color contrast accessibility": ["Color Contrast", "Color Only"],
+        "loading states spinner": ["Loading States", "Loading Buttons"],
+        "keyboard navigation": ["Keyboard Navigation", "Focus States"],
+        "reduced motion animation": ["Reduced Motion", "Excessive Motion"],
+    },
+    "typography": {
+        "elegant serif luxury": ["Luxury Serif", "Classic Elegant", "Real Estate Luxury"],
+        "developer monospace code": ["Developer Mono", "Tech/HUD Mono"],
+        "playful kids education": ["Kids/Education", "Playful Creative"],
+        "dashboard data numbers": ["Dashboard Data"],
+        "financial trust font": ["Financial Trust", "Corporate Trust"],
+    },
+    "icons": {
+        "shopping cart": ["shopping-cart", "shopping-bag"],
+        "delete trash": ["trash-2"],
+        "user profile account": ["user", "users"],
+        "settings gear": ["settings"],
+        "notification bell": ["bell"],
+    },
+    "react": {
+        "barrel imports bundle": ["Barrel Imports"],
+        "parallel fetching promise all": ["Promise.all Parallel", "Parallel Fetching", "Dependency Parallelization"],
+        "memo rerender components": ["Memoized Components"],
+        "suspense streaming": ["Suspense Boundaries"],
+        "lazy state initialization": ["Lazy State Init"],
+    },
+    "web": {
+        "focus outline visible": ["Visible Focus States", "Never Remove Outline", "Outline Replacement"],
+        "autocomplete attribute forms": ["Autocomplete Attribute"],
+        "virtualize long lists": ["Virtualize Lists"],
+        "aria live announcements": ["Aria Live"],
+        "preconnect cdn": ["Preconnect CDN"],
+    },
+}
+
+STACK_QUERIES = {
+    "html-tailwind": {
+        "dark mode": ["Dark mode"],
+        "touch targets buttons": ["Touch targets", "Button sizing"],
+        "z-index fixed elements": ["Fixed elements z-index", "Use Tailwind z-* scale"],
+    },
+    "react": {
+        "useReducer complex state": ["Use useReducer for complex state"],
+        "effect cleanup": ["Clean up effects"],
+        "memoize callbacks": ["Memoize callbacks passed to children", "Memoize expensive calculations"],
+    },
+    "nextjs": {
+        "server components": ["Use Server Components by default", "Fetch data in Server Components"],
+        "image optimization": ["Use next/image for optimization"],
+        "server actions mutations": ["Use Server Actions for mutations"],
+    },
+    "vue": {
+        "computed derived state": ["Use computed for derived state"],
+        "defineProps props": ["Define props with defineProps"],
+    },
+    "nuxtjs": {
+        "useFetch data fetching": ["Use useFetch for simple data fetching", "Use useAsyncData for complex fetching"],
+        "dynamic route parameters": ["Use dynamic route parameters"],
+    },
+    "nuxt-ui": {
+        "form schema validation": ["Use UForm with schema validation"],
+        "semantic color props": ["Use semantic color props"],
+    },
+    "svelte": {
+        "onMount initialization": ["Use onMount for initialization"],
+        "derived computed values": ["Use $derived for computed values", "Use derived for computed stores"],
+    },
+    "swiftui": {
+        "state local": ["Use @State for local state"],
+        "navigation stack": ["Use NavigationStack (iOS 16+)"],
+    },
+    "react-native": {
+        "flatlist long lists": ["Use FlatList for long lists"],
+        "stylesheet create": ["Use StyleSheet.create"],
+    },
+    "flutter": {
+        "const constructors": ["Use const constructors"],
+        "listview builder": ["Use ListView.builder"],
+    },
+    "shadcn": {
+        "dialog modal": ["Use Dialog for modal content"],
+        "zod validation": ["Use Zod for validation"],
+    },
+    "jetpack-compose": {
+        "lazycolumn scroll": ["Prefer LazyColumn over Column scroll"],
+        "remember saveable": ["rememberSaveable"],
+    },
+}
+
+
+# ============ METRICS ============
+def ndcg(ranked, relevant, k=K):
+    """nDCG@k with graded relevance: the first label is worth 2, the others 1."""
+    gains = {name: (2 if i == 0 else 1) for i, name in enumerate(relevant)}
+    dcg = sum(gains.get(name, 0) / log2(pos + 2) for pos, name in enumerate(ranked[:k]))
+    ideal = sorted(gains.values(), reverse=True)[:k]
+    idcg = sum(g / log2(pos + 2) for pos, g in enumerate(ideal))
+    return dcg / idcg if idcg else 0.0
+
+
+def recall(ranked, relevant, k=K):
+    """Share of the relevant rows found in the top k (capped at k)."""
+    return sum(1 for name in relevant if name in ranked[:k]) / min(len(relevant), k)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+# ============ EVALUATION ============
+def evaluate_relevance(rank_domain=None, rank_stack=None):
+    """
+    Per-query metrics. rank_domain(query, domain) / rank_stack(query, stack)
+    return ranked row names; they default to the real search functions.
+    """
+    rank_domain = rank_domain or (lambda q, d: [r.get(NAME_COLS[d], "") for r in search(q, d, K)["results"]])
+    rank_stack = rank_stack or (lambda q, s: [r.get(STACK_NAME_COL, "") for r in search_stack(q, s, K)["results"]])
+    queries = {}
+    for domain, labeled in DOMAIN_QUERIES.items():
+        for query, relevant in labeled.items():
+            ranked = rank_domain(query, domain)
+            queries[f"{domain}|{query}"] = {
+                "ndcg": round(ndcg(ranked, relevant), 6),
+                "recall": round(recall(ranked, relevant), 6),
+                "routed": detect_domain(query) == domain,
+                "top": ranked,
+            }
+    for stack, labeled in STACK_QUERIES.items():
+        for query, relevant in labeled.items():
+            ranked = rank_stack(query, stack)
+            queries[f"stack:{stack}|{query}"] = {
+                "ndcg": round(ndcg(ranked, relevant), 6),
+                "recall": round(recall(ranked, relevant), 6),
+                "top": ranked,
+            }
+    return queries
+
+
+def summarize_relevance(queries):
+    groups = {}
+    for key, metrics in queries.items():
+        groups.setdefault(key.split("|", 1)[0], []).append(metrics)
+    summary = {}
+    for group, items in groups.items():
+        summary[group] = {
+            "queries": len(items),
+            "ndcg@3": round(statistics.mean(m["ndcg"] for m in items), 4),
+            "recall@3": round(statistics.mean(m["recall"] for m in items), 4),
+        }
+        if "routed" in items[0]:
+            summary[group]["routing"] = round(statistics.mean(m["routed"] for m in items), 4)
+    everything = list(queries.values())
+    summary["ALL"] = {
+        "queries": len(everything),
+        "ndcg@3": round(statistics.mean(m["ndcg"] for m in everything), 4),
+        "recall@3": round(statistics.mean(m["recall"] for m in everything), 4),
+        "routing": round(statistics.mean(m["routed"] for m in everything if "routed" in m), 4),
+    }
+    return summary
+
+
+def _sources():
+    """(name, filepath, search_cols, output_cols, boosts) of every indexed CSV"""
+    for domain, config in CSV_CONFIG.items():
+        yield domain, DATA_DIR / config["file"], config["search_cols"], config["output_cols"], config.get("boosts")
+    for stack, config in STACK_CONFIG.items():
+        yield f"stack:{stack}", DATA_DIR / config["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], None
+
+
+def measure_build():
+    """Cold build time per CSV (tokenize + fit, no persisted index) and peak memory for all of them."""
+    timings = {}
+    for name, filepath, search_cols, output_cols, boosts in _sources():
+        if filepath.exists():
+            start = time.perf_counter()
+            _build_index(filepath, search_cols, output_cols, boosts)
+            timings[name] = round((time.perf_counter() - start) * 1000, 3)
+
+    # Separate pass: tracing allocations slows the build down several times
+    tracemalloc.start()
+    indexes = [_build_index(filepath, search_cols, output_cols, boosts)
+               for _, filepath, search_cols, output_cols, boosts in _sources() if filepath.exists()]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del indexes
+    return {
+        "total_ms": round(sum(timings.values()), 3),
+        "slowest": dict(sorted(timings.items(), key=lambda x: -x[1])[:3]),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def measure_latency(rounds=LATENCY_ROUNDS):
+    """Warm per-query latency (ms) of search/search_stack over the labeled queries, batch throughput and generation."""
+    calls = [(q, d, None) for d, labeled in DOMAIN_QUERIES.items() for q in labeled]
+    calls += [(q, None, s) for s, labeled in STACK_QUERIES.items() for q in labeled]
+    for q, d, s in calls:  # Warm every index
+        search_stack(q, s) if s else search(q, d)
+
+    samples = []
+    for _ in range(rounds):
+        for q, d, s in calls:
+            start = time.perf_counter()
+            search_stack(q, s) if s else search(q, d)
+            samples.append((time.perf_counter() - start) * 1000)
+
+    batch = [q for labeled in DOMAIN_QUERIES.values() for q in labeled] * rounds
+    start = time.perf_counter()
+    search_batch(batch)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    # Uncached, to time the generator itself rather than the result cache
+    from design_system import generate_design_system
+    generate_design_system("SaaS dashboard", use_cache=False)
+    design = []
+    for query in ["SaaS dashboard", "fintech investment app", "e-commerce luxury", "healthcare app"] * 5:
+        start = time.perf_counter()
+        generate_design_system(query, use_cache=False)
+        design.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "search_p50_ms": round(percentile(samples, 50), 4),
+        "search_p95_ms": round(percentile(samples, 95), 4),
+        "search_p99_ms": round(percentile(samples, 99), 4),
+        "batch_queries_per_s": round(len(batch) / (batch_ms / 1000)),
+        "design_system_p50_ms": round(percentile(design, 50), 3),
+    }
+
+
+def sweep(k1_values=(0.9, 1.2, 1.5, 1.8, 2.1), b_values=(0.3, 0.5, 0.75, 0.9)):
+    """Mean nDCG@3 over all labeled queries for each (k1, b), fitting fresh indexes."""
+    corpora = {}
+    for name, filepath, search_cols, output_cols, boosts in _sources():
+        if filepath.exists():
+            rows = _load_csv(filepath)
+            name_col = STACK_NAME_COL if name.startswith("stack:") else NAME_COLS[name]
+            documents = [[str(row.get(col, "")) for col in search_cols] for row in rows]
+            weights = [boosts.get(col, 1) for col in search_cols] if boosts else None
+            corpora[name] = (documents, weights, [row.get(name_col, "") for row in rows])
+
+    grid = {}
+    for k1 in k1_values:
+        for b in b_values:
+            fitted = {}
+            for name, (documents, weights, names) in corpora.items():
+                bm25 = BM25(k1, b)
+                bm25.fit(documents, weights)
+                fitted[name] = (bm25, names)
+
+            def rank(query, name):
+                bm25, names = fitted[name]
+                return [names[idx] for idx, score in bm25.score(query, K) if score > 0]
+
+            queries = evaluate_relevance(lambda q, d: rank(q, d), lambda q, s: rank(q, f"stack:{s}"))
+            grid[f"k1={k1} b={b}"] = round(statistics.mean(m["ndcg"] for m in queries.values()), 4)
+    return dict(sorted(grid.items(), key=lambda x: -x[1]))
+
+
+# ============ REGRESSION CHECK ============
+def compare(report, baseline, max_slowdown=None):
+    """List of regressions of report against baseline."""
+    failures = []
+    for key, old in baseline.get("queries", {}).items():
+        new = report["queries"].get(key)
+        if new is None:
+            failures.append(f"{key}: labeled query missing")
+            continue
+        for metric in ("ndcg", "recall"):
+            if new[metric] < old[metric] - 1e-6:
+                failures.append(f"{key}: {metric} {old[metric]:.3f} -> {new[metric]:.3f} (top: {new['top']})")
+        if old.get("routed") and not new.get("routed"):
+            failures.append(f"{key}: detect_domain no longer routes here")
+    if max_slowdown and "latency" in baseline:
+        for metric in ("search_p95_ms", "design_system_p50_ms"):
+            if report["latency"][metric] > baseline["latency"][metric] * max_slowdown:
+                failures.append(f"latency {metric}: {baseline['latency'][metric]} -> {report['latency'][metric]} ms")
+    return failures
+
+
+def format_report(report, failures):
+    lines = ["## UI Pro Max Benchmark", "", "| Group | Queries | nDCG@3 | Recall@3 | Routing |", "|---|---|---|---|---|"]
+    for group, s in report["summary"].items():
+        routing = f"{s['routing']:.2f}" if "routing" in s else "-"
+        lines.append(f"| {group} | {s['queries']} | {s['ndcg@3']:.3f} | {s['recall@3']:.3f} | {routing} |")
+    lines.append("")
+    build = report["build"]
+    lines.append(f"**Index build:** {build['total_ms']} ms for all CSVs, peak memory {build['peak_memory_kb']} KB "
+                 f"(slowest: {', '.join(f'{k} {v} ms' for k, v in build['slowest'].items())})")
+    lat = report["latency"]
+    lines.append(f"**Search latency:** p50 {lat['search_p50_ms']} ms, p95 {lat['search_p95_ms']} ms, "
+                 f"p99 {lat['search_p99_ms']} ms | **Batch:** {lat['batch_queries_per_s']} queries/s | "
+                 f"**Design system:** p50 {lat['design_system_p50_ms']} ms")
+    lines.append("")
+    if failures:
+        lines.append(f"**FAIL:** {len(failures)} regression(s)")
+        lines.extend(f"- {f}" for f in failures)
+    else:
+        lines.append("**OK:** no regressions against the baseline")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max search benchmark")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the current results to the baseline file")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="Baseline file (default: benchmark_baseline.json)")
+    parser.add_argument("--max-slowdown", type=float, default=None, help="Also fail when p95 latency exceeds baseline x this factor")
+    parser.add_argument("--sweep", action="store_true", help="Evaluate a grid of BM25 k1/b values")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    if args.sweep:
+        grid = sweep()
+        print(json.dumps(grid, indent=2) if args.json else "\n".join(f"{k}: nDCG@3 {v:.4f}" for k, v in grid.items()))
+        sys.exit(0)
+
+    queries = evaluate_relevance()
+    report = {
+        "summary": summarize_relevance(queries),
+        "build": measure_build(),
+        "latency": measure_latency(),
+        "queries": queries,
+    }
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        failures = []
+    elif baseline_path.exists():
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            failures = compare(report, json.load(f), args.max_slowdown)
+    else:
+        failures = []
+
+    if args.json:
+        print(json.dumps({**report, "failures": failures}, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(report, failures))
+    sys.exit(1 if failures else 0)
@@ -5,15 +5,44 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import hashlib
+import os
+import pickle
 import re
+import heapq
+import tempfile
+import unicodedata
+from array import array
+from functools import lru_cache
 from pathlib import Path
 from math import log
 from collections import defaultdict
 
+try:
+    import numpy as np
+except ImportError:  # Batch scoring falls back to the pure-Python BM25
+    np = None
+
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
+INDEX_DIR = DATA_DIR / ".index"
+INDEX_VERSION = 2
+
+# Plural stemming in the tokenizer (see stem()). Off by default: on the
+# benchmark.py query set it helps two queries ("user profile account",
+# "touch targets buttons") but costs more on two others ("bento grid layout",
+# "navigation stack"), for a lower mean nDCG@3.
+STEMMING = False
+
+# Query terms missing from an index are matched to the closest vocabulary term
+# (see FuzzyVocabulary) at a reduced weight, so a guess never outranks an
+# exact match; 0.5 scored best on benchmark.py (1.0 pulls "ecommerce" onto
+# "commerce" in the color palettes)
+FUZZY = True
+FUZZY_WEIGHT = 0.5
 MAX_RESULTS = 3
 
+# Optional per-domain "boosts": {search column: weight} (defaults to 1 for every column)
 CSV_CONFIG = {
     "style": {
         "file": "styles.csv",
@@ -96,67 +125,268 @@ _STACK_COLS = {
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
+# ============ TOKENIZER ============
+_WORD_RE = re.compile(r"\w+")
+
+# Two-letter tokens that carry meaning here; other words of length <= 2 are dropped
+SHORT_TOKENS = frozenset({"ai", "ar", "vr", "ui", "ux", "3d", "2d", "qr", "js", "ml"})
+
+
+def fold_accents(text):
+    """'Café' -> 'Cafe'; ASCII text is returned as is"""
+    if text.isascii():
+        return text
+    return "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+
+
+def stem(word):
+    """Light plural stemmer (Harman's S-stemmer): dashboards -> dashboard, galleries -> gallery"""
+    if len(word) <= 3 or word[-1] != "s":
+        return word
+    if word.endswith("ies") and not word.endswith(("eies", "aies")):
+        return word[:-3] + "y"
+    if word.endswith("es") and not word.endswith(("aes", "ees", "oes")):
+        return word[:-1]
+    if not word.endswith(("us", "ss")):
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=4096)
+def _tokenize(text, stemming):
+    tokens = []
+    for word in _WORD_RE.findall(fold_accents(text.lower())):
+        if len(word) > 2:
+            tokens.append(stem(word) if stemming else word)
+        elif word in SHORT_TOKENS:
+            tokens.append(word)
+    return tuple(tokens)
+
+
+def tokenize(text, stemming=None):
+    """Lowercase, fold accents, split on non-word characters, drop short words (except SHORT_TOKENS), stem"""
+    return _tokenize(str(text), STEMMING if stemming is None else stemming)
+
+
+# ============ FUZZY MATCHING ============
+def max_edit_distance(length):
+    """Typos tolerated in a word of this length: none below 5 characters, two from 9"""
+    return 2 if length >= 9 else 1 if length >= 5 else 0
+
+
+def _deletes(word, depth):
+    """word and every string obtained by deleting up to `depth` characters from it"""
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance (adjacent transpositions count 1), or limit + 1 beyond limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class FuzzyVocabulary:
+    """
+    Maps a query term missing from an index onto its closest vocabulary term.
+    Typos go through a symmetric-delete (SymSpell) table: every term is stored
+    under all its deletes up to max_edit_distance(len(term)), so a lookup only
+    generates the query word's own deletes (at most 1 + L + L(L-1)/2 probes)
+    and verifies the few terms found, whatever the vocabulary size. Words with
+    no close term may be the start of one ("dashb"), answered from a table of
+    prefixes. Ties go to the term found in more documents.
+    """
+
+    MIN_PREFIX = 4
+
+    def __init__(self, terms, doc_freqs):
+        self.rank = {term: (-df, len(term), term) for term, df in zip(terms, doc_freqs)}
+        self.deletes = defaultdict(list)
+        self.prefixes = {}
+        for term in terms:
+            for key in _deletes(term, max_edit_distance(len(term))):
+                self.deletes[key].append(term)
+            for end in range(self.MIN_PREFIX, len(term)):
+                best = self.prefixes.get(term[:end])
+                if best is None or self.rank[term] < self.rank[best]:
+                    self.prefixes[term[:end]] = term
+        self.deletes = dict(self.deletes)
+        self.cache = {}
+
+    def correct(self, word):
+        """(closest term, edit distance) for a word not in the vocabulary, or None"""
+        if word in self.cache:
+            return self.cache[word]
+        limit = max_edit_distance(len(word))
+        best = None
+        if limit:
+            seen = set()
+            for key in _deletes(word, limit):
+                for term in self.deletes.get(key, ()):
+                    if term in seen:
+                        continue
+                    seen.add(term)
+                    distance = edit_distance(word, term, limit)
+                    if distance <= limit and (best is None or (distance, self.rank[term]) < (best[1], self.rank[best[0]])):
+                        best = (term, distance)
+        if best is None and word in self.prefixes:
+            best = (self.prefixes[word], 0)
+        self.cache[word] = best
+        return best
+
+
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
-
-    def __init__(self, k1=1.5, b=0.75):
+    """
+    BM25 ranking algorithm for text search, backed by an inverted index.
+    Terms are interned to integer ids; each term's postings are a pair of
+    compact arrays (doc ids, term frequencies). Query terms outside the
+    vocabulary are matched fuzzily (see query_terms).
+    """
+
+    def __init__(self, k1=1.5, b=0.75, stemming=None):
         self.k1 = k1
         self.b = b
-        self.corpus = []
-        self.doc_lengths = []
+        self.stemming = STEMMING if stemming is None else stemming
+        self.vocab = {}
+        self.terms = []
+        self.doc_lengths = array("d")
         self.avgdl = 0
-        self.idf = {}
-        self.doc_freqs = defaultdict(int)
+        self.idf = array("d")
+        self.doc_freqs = array("l")
+        self.postings = []
+        self.norms = array("d")
         self.N = 0
+        self._fuzzy = None
 
     def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
-
-    def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        """Tokens of text, see core.tokenize"""
+        return _tokenize(str(text), self.stemming)
+
+    def fit(self, documents, boosts=None):
+        """
+        Build the inverted index: term id -> (doc ids, tfs), plus per-doc length norms.
+        A document may also be a list of field texts; with `boosts` (one weight
+        per field) tf and length count each field's tokens times its boost.
+        """
+        vocab = {}
+        doc_ids, freqs = [], []
+        doc_lengths = []
+        for idx, doc in enumerate(documents):
+            fields = [doc] if isinstance(doc, str) else doc
+            doc_len = 0
+            term_freqs = defaultdict(int)
+            for pos, text in enumerate(fields):
+                boost = boosts[pos] if boosts else 1
+                tokens = self.tokenize(text)
+                doc_len += boost * len(tokens)
+                for word in tokens:
+                    term_freqs[word] += boost
+            doc_lengths.append(doc_len)
+            for word, tf in term_freqs.items():
+                term_id = vocab.get(word)
+                if term_id is None:
+                    term_id = vocab[word] = len(vocab)
+                    doc_ids.append(array("l"))
+                    freqs.append(array("d"))
+                doc_ids[term_id].append(idx)
+                freqs[term_id].append(tf)
+
+        self.vocab = vocab
+        self.terms = list(vocab)
+        self.postings = list(zip(doc_ids, freqs))
+        self.doc_lengths = array("d", doc_lengths)
+        self.N = len(doc_lengths)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
-        self.avgdl = sum(self.doc_lengths) / self.N
-
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
-
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
-
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
-
-            scores.append((idx, score))
-
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        self.avgdl = sum(doc_lengths) / self.N
+
+        # k1 * (1 - b + b * |d| / avgdl) only depends on the document
+        self.norms = array("d", (self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in doc_lengths))
+        self.doc_freqs = array("l", (len(ids) for ids in doc_ids))
+        self.idf = array("d", (log((self.N - df + 0.5) / (df + 0.5) + 1) for df in self.doc_freqs))
+
+    def correct(self, token):
+        """
+        (vocabulary term, weight) standing in for a token missing from the
+        vocabulary: a typo fix or prefix completion weighted FUZZY_WEIGHT, or
+        None. The lookup table is built on first use.
+        """
+        if not FUZZY:
+            return None
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyVocabulary(self.terms, self.doc_freqs)
+        match = self._fuzzy.correct(token)
+        return (match[0], FUZZY_WEIGHT) if match else None
+
+    def query_terms(self, query):
+        """[(term id, weight)] for the query's tokens, exact matches weighing 1"""
+        terms = []
+        for token in self.tokenize(query):
+            term_id = self.vocab.get(token)
+            if term_id is not None:
+                terms.append((term_id, 1.0))
+                continue
+            match = self.correct(token)
+            if match:
+                terms.append((self.vocab[match[0]], match[1]))
+        return terms
+
+    def term_weights(self):
+        """Yield (term, doc ids, BM25 weight per doc) for every term, for precomputed backends"""
+        k1_plus_1 = self.k1 + 1
+        norms = self.norms
+        for term, (ids, tfs), idf in zip(self.terms, self.postings, self.idf):
+            yield term, ids, [idf * (tf * k1_plus_1) / (tf + norms[idx]) for idx, tf in zip(ids, tfs)]
+
+    def score(self, query, top_k=None):
+        """
+        Score documents containing at least one query term.
+        Returns [(doc id, score)] best first (ties by doc id), limited to top_k.
+        """
+        scores = defaultdict(float)
+        k1_plus_1 = self.k1 + 1
+        norms = self.norms
+        for term_id, weight in self.query_terms(query):
+            idf = self.idf[term_id]
+            ids, tfs = self.postings[term_id]
+            if weight == 1.0:
+                for idx, tf in zip(ids, tfs):
+                    scores[idx] += idf * (tf * k1_plus_1) / (tf + norms[idx])
+            else:
+                for idx, tf in zip(ids, tfs):
+                    scores[idx] += idf * (tf * k1_plus_1) / (tf + norms[idx]) * weight
+
+        if top_k is None:
+            return sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return heapq.nsmallest(top_k, scores.items(), key=lambda x: (-x[1], x[0]))
+
+    def state(self):
+        """Fitted index as plain data, for persisting"""
+        return {key: value for key, value in self.__dict__.items() if key != "_fuzzy"}
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a fitted BM25 from state() without re-tokenizing the corpus"""
+        bm25 = cls(state["k1"], state["b"], state["stemming"])
+        bm25.__dict__.update(state)
+        return bm25
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -166,29 +396,126 @@ def _load_csv(filepath):
         return list(csv.DictReader(f))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+# Loaded indexes, keyed by (CSV path, columns): {"stat", "bm25", "rows"}
+_INDEXES = {}
 
+
+def _file_stat(filepath):
+    stat = filepath.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _file_digest(filepath):
+    return hashlib.sha1(filepath.read_bytes()).hexdigest()
+
+
+def _index_path(filepath, search_cols, output_cols, boosts=None):
+    """Index file per CSV and column config, e.g. .index/stacks-react-1a2b3c4d.idx"""
+    name = str(filepath.relative_to(DATA_DIR).with_suffix("")).replace(os.sep, "-")
+    cols = hashlib.sha1(repr((search_cols, output_cols, boosts, STEMMING)).encode("utf-8")).hexdigest()[:8]
+    return INDEX_DIR / f"{name}-{cols}.idx"
+
+
+def _build_index(filepath, search_cols, output_cols, boosts=None):
+    """Tokenize and fit one CSV; rows keep only the output columns"""
     data = _load_csv(filepath)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+    # One document per row, one field per search column
+    documents = [[str(row.get(col, "")) for col in search_cols] for row in data]
 
-    # BM25 search
     bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+    bm25.fit(documents, [boosts.get(col, 1) for col in search_cols] if boosts else None)
+    rows = [{col: row.get(col, "") for col in output_cols if col in row} for row in data]
+    return bm25, rows
+
+
+def _write_index(index_path, payload):
+    """Atomically write an index file; a read-only data dir just means no persisted index"""
+    try:
+        INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=INDEX_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, index_path)
+    except OSError:
+        pass
+
+
+def load_index(filepath, search_cols, output_cols, force=False, boosts=None):
+    """
+    Return (bm25, rows) for a CSV from the fastest valid source: this
+    process's cache, the persisted index in INDEX_DIR, or a fresh build.
+    An index is stale when the CSV's mtime/size changed and its content
+    hash no longer matches; stale indexes are rebuilt and re-persisted.
+    `boosts` ({column: weight}) weights search columns, see BM25.fit.
+    """
+    boosts = dict(sorted(boosts.items())) if boosts else None
+    key = (str(filepath), tuple(search_cols), tuple(output_cols), repr(boosts))
+    stat = _file_stat(filepath)
+    cached = _INDEXES.get(key)
+    if cached and cached["stat"] == stat and not force:
+        return cached["bm25"], cached["rows"]
+
+    index_path = _index_path(filepath, search_cols, output_cols, boosts)
+    payload = None
+    if not force and index_path.exists():
+        try:
+            with open(index_path, "rb") as f:
+                payload = pickle.load(f)
+        except Exception:
+            payload = None
+        if payload and payload.get("version") != INDEX_VERSION:
+            payload = None
+        if payload and payload["stat"] != stat:
+            # Touched but maybe not modified (checkout, copy): compare content
+            if payload["sha1"] == _file_digest(filepath):
+                payload["stat"] = stat
+                _write_index(index_path, payload)
+            else:
+                payload = None
+
+    if payload:
+        bm25, rows = BM25.from_state(payload["bm25"]), payload["rows"]
+    else:
+        bm25, rows = _build_index(filepath, search_cols, output_cols, boosts)
+        _write_index(index_path, {
+            "version": INDEX_VERSION,
+            "stat": stat,
+            "sha1": _file_digest(filepath),
+            "bm25": bm25.state(),
+            "rows": rows,
+        })
+
+    _INDEXES[key] = {"stat": stat, "bm25": bm25, "rows": rows}
+    return bm25, rows
+
+
+def build_indexes(force=False):
+    """Prebuild the persisted index of every domain and stack CSV; returns the files indexed"""
+    built = []
+    for config in CSV_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            load_index(filepath, config["search_cols"], config["output_cols"], force, config.get("boosts"))
+            built.append(config["file"])
+    for config in STACK_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            load_index(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], force)
+            built.append(config["file"])
+    return built
+
+
+def _search_csv(filepath, search_cols, output_cols, query, max_results, boosts=None):
+    """Core search function using BM25"""
+    if not filepath.exists():
+        return []
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+    bm25, rows = load_index(filepath, search_cols, output_cols, boosts=boosts)
+    ranked = bm25.score(query, max_results)
 
-    return results
+    # Get top results with score > 0
+    return [dict(rows[idx]) for idx, score in ranked if score > 0]
 
 
 def detect_domain(query):
@@ -225,7 +552,7 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results, config.get("boosts"))
 
     return {
         "domain": domain,
@@ -256,3 +583,253 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+
+
+# ============ MULTI-DOMAIN INDEX ============
+class MultiDomainIndex:
+    """
+    Every CSV_CONFIG domain behind one vocabulary: term -> {domain: [(doc id,
+    BM25 weight)]}. Weights are precomputed from each domain's own index, so
+    per-domain rankings are exactly those of search(); several domains (and
+    queries sharing a prefix) are scored in one pass over the postings.
+    """
+
+    def __init__(self, domains=None):
+        self.domains = [d for d in (domains or CSV_CONFIG) if (DATA_DIR / CSV_CONFIG[d]["file"]).exists()]
+        self.postings = defaultdict(dict)
+        self.indexes = {}
+        self.rows = {}
+        self.stats = {}
+        self.fuzzy = {}
+        self.tokenize = BM25().tokenize
+        for domain in self.domains:
+            config = CSV_CONFIG[domain]
+            filepath = DATA_DIR / config["file"]
+            bm25, rows = load_index(filepath, config["search_cols"], config["output_cols"], boosts=config.get("boosts"))
+            self.indexes[domain] = bm25
+            self.rows[domain] = rows
+            self.stats[str(filepath)] = _file_stat(filepath)
+            for term, ids, weights in bm25.term_weights():
+                self.postings[term][domain] = list(zip(ids, weights))
+        self.postings = dict(self.postings)
+
+    def is_fresh(self):
+        for path, stat in self.stats.items():
+            current = os.stat(path)
+            if (current.st_mtime_ns, current.st_size) != stat:
+                return False
+        return True
+
+    def accumulate(self, query, domains, scores=None):
+        """
+        Add `query`'s term weights for `domains` into scores ({domain: {doc
+        id: score}}, a new dict by default). Calling it again with more terms
+        continues the same sums, e.g. to extend one domain's query.
+        """
+        scores = scores if scores is not None else {}
+        for domain in domains:
+            scores.setdefault(domain, defaultdict(float))
+        for token in self.tokenize(query):
+            for domain in domains:
+                plist = self.lookup(token, domain)
+                if plist:
+                    acc = scores[domain]
+                    for idx, weight in plist:
+                        acc[idx] += weight
+        return scores
+
+    def lookup(self, token, domain):
+        """[(doc id, weight)] of a query token in one domain, fuzzy-matched like BM25.score"""
+        plist = self.postings.get(token, {}).get(domain)
+        if plist is not None:
+            return plist
+        key = (token, domain)
+        if key not in self.fuzzy:
+            match = self.indexes[domain].correct(token)
+            if match:
+                term, scale = match
+                self.fuzzy[key] = [(idx, weight * scale) for idx, weight in self.postings[term][domain]]
+            else:
+                self.fuzzy[key] = ()
+        return self.fuzzy[key]
+
+    def result(self, domain, query, scores, max_results=MAX_RESULTS):
+        """search()-shaped result for one domain from accumulated scores"""
+        ranked = heapq.nsmallest(max_results, scores.get(domain, {}).items(), key=lambda x: (-x[1], x[0]))
+        results = [dict(self.rows[domain][idx]) for idx, score in ranked if score > 0]
+        return {
+            "domain": domain,
+            "query": query,
+            "file": CSV_CONFIG[domain]["file"],
+            "count": len(results),
+            "results": results
+        }
+
+    def search_many(self, requests):
+        """
+        Answer [(domain, query, max_results)] in one pass: requests are
+        walked as a prefix tree of their query tokens, so a shared query is
+        scored once for all its domains and only diverging suffixes add work.
+        """
+        requests = [(i, domain, query, n, self.tokenize(query)) for i, (domain, query, n) in enumerate(requests)]
+        answers = [None] * len(requests)
+        pending = [(0, requests, {})]
+        while pending:
+            depth, group, scores = pending.pop()
+            branches = defaultdict(list)
+            for request in group:
+                if len(request[4]) == depth:
+                    i, domain, query, n, _ = request
+                    answers[i] = self.result(domain, query, scores, n)
+                else:
+                    branches[request[4][depth]].append(request)
+            for token, branch in branches.items():
+                domains = list(dict.fromkeys(r[1] for r in branch))
+                # Branches may not share accumulators once their tokens diverge
+                child = scores if len(branches) == 1 else {d: defaultdict(float, scores.get(d, {})) for d in domains}
+                for domain in domains:
+                    acc = child.setdefault(domain, defaultdict(float))
+                    for idx, weight in self.lookup(token, domain):
+                        acc[idx] += weight
+                pending.append((depth + 1, branch, child))
+        return answers
+
+
+_MULTI_INDEX = None
+
+
+def get_multi_index():
+    """Process-wide MultiDomainIndex, rebuilt when any domain CSV changes"""
+    global _MULTI_INDEX
+    if _MULTI_INDEX is None or not _MULTI_INDEX.is_fresh():
+        _MULTI_INDEX = MultiDomainIndex()
+    return _MULTI_INDEX
+
+
+def search_many(requests):
+    """Batch of (domain, query, max_results) answered from the shared multi-domain index"""
+    return get_multi_index().search_many(requests)
+
+
+# ============ SPARSE BATCH BACKEND ============
+class SparseBM25:
+    """
+    A fitted BM25 as a CSR term-document matrix of precomputed term weights
+    (NumPy arrays indptr/indices/data, one row per vocabulary term plus an
+    empty row for unknown terms). A batch of queries is scored position by
+    position: the j-th tokens of all queries select one matrix row each (a
+    one-hot selection matrix times the CSR matrix) and are added into a dense
+    (queries x docs) score array, fuzzy-matched terms scaled by their weight.
+    Terms are added in query order, exactly like BM25.score, so scores and
+    rankings are bit-identical.
+    """
+
+    def __init__(self, bm25):
+        self.vocab = bm25.vocab
+        self.query_terms = bm25.query_terms
+        self.N = bm25.N
+        indptr, indices, data = [0], [], []
+        for _, ids, weights in bm25.term_weights():
+            indices.extend(ids)
+            data.extend(weights)
+            indptr.append(len(indices))
+        indptr.append(len(indices))  # Unknown / padding term
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        self.data = np.array(data, dtype=np.float64)
+
+    def score_batch(self, queries, top_k=MAX_RESULTS):
+        """[(doc id, score)] per query, best first (ties by doc id), positive scores only"""
+        unknown = len(self.vocab)
+        terms = [self.query_terms(q) for q in queries]
+        width = max((len(t) for t in terms), default=0)
+        padded = np.full((len(queries), width), unknown, dtype=np.int64)
+        scales = np.ones((len(queries), width))
+        for q, query_terms in enumerate(terms):
+            for j, (term_id, weight) in enumerate(query_terms):
+                padded[q, j] = term_id
+                scales[q, j] = weight
+        fuzzy = bool((scales != 1.0).any())
+
+        scores = np.zeros((len(queries), self.N))
+        for j in range(width):
+            rows = padded[:, j]
+            starts = self.indptr[rows]
+            lengths = self.indptr[rows + 1] - starts
+            # Flat positions of every selected row's entries in indices/data
+            positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            # A term lists each doc once, so (query, doc) pairs are unique here
+            values = self.data[positions]
+            if fuzzy:
+                values = values * np.repeat(scales[:, j], lengths)
+            scores[np.repeat(np.arange(len(queries)), lengths), self.indices[positions]] += values
+
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :top_k]
+        top = np.take_along_axis(scores, order, axis=1)
+        return [[(int(i), float(v)) for i, v in zip(idx_row, score_row) if v > 0]
+                for idx_row, score_row in zip(order, top)]
+
+
+# Sparse matrices per loaded index: {index key: (bm25, SparseBM25)}
+_SPARSE = {}
+
+
+def _sparse_for(filepath, search_cols, output_cols, boosts=None):
+    bm25, rows = load_index(filepath, search_cols, output_cols, boosts=boosts)
+    key = (str(filepath), tuple(search_cols), tuple(output_cols))
+    cached = _SPARSE.get(key)
+    if not cached or cached[0] is not bm25:
+        cached = (bm25, SparseBM25(bm25))
+        _SPARSE[key] = cached
+    return cached[1], rows
+
+
+def search_batch(queries, domain=None, max_results=MAX_RESULTS, stack=None):
+    """
+    search() (or search_stack() with `stack`) for many queries at once, same
+    results in the same order. Uses the sparse NumPy backend when available;
+    without NumPy each query goes through the pure-Python path.
+    """
+    queries = list(queries)
+    if np is None or (stack is not None and stack not in STACK_CONFIG):
+        if stack is not None:
+            return [search_stack(q, stack, max_results) for q in queries]
+        return [search(q, domain, max_results) for q in queries]
+
+    if stack is not None:
+        filepath = DATA_DIR / STACK_CONFIG[stack]["file"]
+        if not filepath.exists():
+            return [search_stack(q, stack, max_results) for q in queries]
+        matrix, rows = _sparse_for(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"])
+        return [{
+            "domain": "stack",
+            "stack": stack,
+            "query": q,
+            "file": STACK_CONFIG[stack]["file"],
+            "count": len(ranked),
+            "results": [dict(rows[idx]) for idx, _ in ranked]
+        } for q, ranked in zip(queries, matrix.score_batch(queries, max_results))]
+
+    # Group by (auto-detected) domain, one matrix product per domain
+    answers = [None] * len(queries)
+    groups = defaultdict(list)
+    for i, q in enumerate(queries):
+        groups[domain if domain is not None else detect_domain(q)].append(i)
+    for group_domain, members in groups.items():
+        config = CSV_CONFIG.get(group_domain, CSV_CONFIG["style"])
+        filepath = DATA_DIR / config["file"]
+        if not filepath.exists():
+            for i in members:
+                answers[i] = search(queries[i], group_domain, max_results)
+            continue
+        matrix, rows = _sparse_for(filepath, config["search_cols"], config["output_cols"], config.get("boosts"))
+        group_queries = [queries[i] for i in members]
+        for i, q, ranked in zip(members, group_queries, matrix.score_batch(group_queries, max_results)):
+            answers[i] = {
+                "domain": group_domain,
+                "query": q,
+                "file": config["file"],
+                "count": len(ranked),
+                "results": [dict(rows[idx]) for idx, _ in ranked]
+            }
+    return answers
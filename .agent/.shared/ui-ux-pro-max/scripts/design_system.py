@@ -11,14 +11,23 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Many pages at once (shared searches, unchanged files left alone)
+    result = generate_design_system("SaaS dashboard", "My Project", persist=True,
+                                    pages=[{"page": "Settings", "query": "account preferences"}, "Reports"])
 """
 
 import csv
+import hashlib
 import json
 import os
+import re
+import tempfile
+from bisect import bisect_right
+from collections import defaultdict, deque, OrderedDict
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import get_multi_index, DATA_DIR, _file_digest
 
 
 # ============ CONFIGURATION ============
@@ -32,58 +41,191 @@ SEARCH_CONFIG = {
     "typography": {"max_results": 2}
 }
 
+# Generated design systems and page overrides are cached per input and data
+# version (see ResultCache); bump CACHE_VERSION when the output shape changes
+CACHE_DIR = DATA_DIR / ".cache" / "design-system"
+CACHE_VERSION = 1
+CACHE_SIZE = 256    # Entries kept in memory
+CACHE_FILES = 1024  # Entries kept on disk
+
+# Searches behind a page override file: (domain, max_results)
+OVERRIDE_SEARCHES = (("style", 1), ("ux", 3), ("landing", 1))
+
+
+# ============ REASONING RULE INDEX ============
+class _Automaton:
+    """Aho-Corasick automaton: reports every pattern occurring in a text in one scan."""
+
+    def __init__(self, patterns: dict):
+        """patterns: {pattern: payload}; empty patterns are ignored."""
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for pattern, payload in patterns.items():
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(payload)
+
+        # Breadth-first failure links; each node also reports its suffixes' patterns
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                fail = self.fail[node]
+                while fail and ch not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[nxt] = self.goto[fail].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text: str):
+        """Yield the payload of every pattern occurrence in text."""
+        node = 0
+        for ch in text:
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            yield from self.out[node]
+
+
+class ReasoningIndex:
+    """
+    ui-reasoning.csv rules compiled for lookup by product category, with the
+    same precedence as scanning the rules in order:
+      1. exact category match (hash map)
+      2. rule category contained in the query (Aho-Corasick) or the query
+         contained in a rule category (one find over all categories joined)
+      3. any word of a rule category contained in the query (Aho-Corasick)
+    Each step returns the earliest rule in file order.
+    """
+
+    EXACT, PARTIAL, KEYWORD = range(3)
+
+    def __init__(self, rules: list):
+        self.rules = rules
+        self.exact = {}
+        self.partial_empty = None
+        first = {}
+        categories = []
+        for idx, rule in enumerate(rules):
+            ui_cat = rule.get("UI_Category", "").lower()
+            categories.append(ui_cat)
+            self.exact.setdefault(ui_cat, idx)
+            if not ui_cat and self.partial_empty is None:
+                # An empty category is contained in every query
+                self.partial_empty = idx
+            first.setdefault((ui_cat, self.PARTIAL), idx)
+            for kw in ui_cat.replace("/", " ").replace("-", " ").split():
+                first.setdefault((kw, self.KEYWORD), idx)
+
+        patterns = defaultdict(list)
+        for (pattern, role), idx in first.items():
+            patterns[pattern].append((role, idx))
+        self.automaton = _Automaton({pattern: tuple(payload) for pattern, payload in patterns.items()})
+
+        # "\0" never occurs in a query, so a match can't straddle two categories
+        self.joined = "\0".join(categories)
+        self.starts = []
+        offset = 0
+        for ui_cat in categories:
+            self.starts.append(offset)
+            offset += len(ui_cat) + 1
+        self.cache = {}
+
+    def _contained_in_rule(self, category_lower: str):
+        """Earliest rule whose category contains category_lower, or None."""
+        pos = self.joined.find(category_lower)
+        if pos < 0 or not self.rules:
+            return None
+        return bisect_right(self.starts, pos) - 1
+
+    def find(self, category: str) -> dict:
+        """Matching rule for a category, {} if none."""
+        category_lower = category.lower()
+        if category_lower in self.cache:
+            return self.cache[category_lower]
+
+        idx = self.exact.get(category_lower)
+        if idx is None:
+            best = {self.PARTIAL: self.partial_empty, self.KEYWORD: None}
+            for payload in self.automaton.find(category_lower):
+                for role, rule_idx in payload:
+                    if best[role] is None or rule_idx < best[role]:
+                        best[role] = rule_idx
+            contained = self._contained_in_rule(category_lower)
+            partial = [i for i in (best[self.PARTIAL], contained) if i is not None]
+            idx = min(partial) if partial else best[self.KEYWORD]
+
+        rule = self.rules[idx] if idx is not None else {}
+        self.cache[category_lower] = rule
+        return rule
+
+
+# Compiled reasoning rules per file, reused while the CSV is unchanged
+_REASONING = {}
+
+
+def load_reasoning_index(filepath: Path = None) -> ReasoningIndex:
+    """ReasoningIndex for ui-reasoning.csv, compiled once per file version."""
+    filepath = filepath or DATA_DIR / REASONING_FILE
+    if not filepath.exists():
+        return ReasoningIndex([])
+    stat = filepath.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _REASONING.get(str(filepath))
+    if not cached or cached[0] != key:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            cached = (key, ReasoningIndex(list(csv.DictReader(f))))
+        _REASONING[str(filepath)] = cached
+    return cached[1]
+
 
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
     """Generates design system recommendations from aggregated searches."""
 
     def __init__(self):
-        self.reasoning_data = self._load_reasoning()
+        self.reasoning_index = load_reasoning_index()
+        self.reasoning_data = self.reasoning_index.rules
 
     def _load_reasoning(self) -> list:
         """Load reasoning rules from CSV."""
-        filepath = DATA_DIR / REASONING_FILE
-        if not filepath.exists():
-            return []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
-
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
+        return load_reasoning_index().rules
+
+    def _multi_domain_search(self, query: str, style_priority: list = None, scores: dict = None) -> dict:
+        """
+        Execute searches across multiple domains in one pass over the shared
+        index. `scores` are the query's accumulated scores if already computed.
+        """
+        index = get_multi_index()
+        if scores is None:
+            scores = index.accumulate(query, list(SEARCH_CONFIG))
         results = {}
         for domain, config in SEARCH_CONFIG.items():
             if domain == "style" and style_priority:
-                # For style, also search with priority keywords
+                # For style, also search with priority keywords: continue the
+                # query's sums with the extra terms, same as searching both
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                style_scores = index.accumulate(priority_query, [domain], {domain: defaultdict(float, scores[domain])})
+                results[domain] = index.result(domain, combined_query, style_scores, config["max_results"])
             else:
-                results[domain] = search(query, domain, config["max_results"])
+                results[domain] = index.result(domain, query, scores, config["max_results"])
         return results
 
     def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
-        category_lower = category.lower()
-
-        # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
-
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
-
-        return {}
+        """Find matching reasoning rule for a category (see ReasoningIndex)."""
+        return self.reasoning_index.find(category)
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
@@ -162,8 +304,10 @@ class DesignSystemGenerator:
 
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
-        # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        # Step 1: Score the query once for every domain; product gives the category
+        index = get_multi_index()
+        scores = index.accumulate(query, list(SEARCH_CONFIG))
+        product_result = index.result("product", query, scores, 1)
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
@@ -174,7 +318,7 @@ class DesignSystemGenerator:
         style_priority = reasoning.get("style_priority", [])
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
+        search_results = self._multi_domain_search(query, style_priority, scores)
         search_results["product"] = product_result  # Reuse product search
 
         # Step 4: Select best matches from each domain using priority
@@ -458,9 +602,148 @@ def format_markdown(design_system: dict) -> str:
     return "\n".join(lines)
 
 
+# ============ RESULT CACHE ============
+# Content hash per file, recomputed only when its mtime/size changes
+_DIGESTS = {}
+_VERSION = {"stats": None, "version": None}
+
+
+def data_version() -> str:
+    """
+    Hash of every data CSV plus the scripts that turn them into results, so
+    it changes whenever any of them does.
+    """
+    scripts = os.path.dirname(os.path.abspath(__file__))
+    data_dir = str(DATA_DIR)
+    paths = sorted(os.path.join(data_dir, name) for name in os.listdir(data_dir) if name.endswith(".csv"))
+    paths += [os.path.join(scripts, "core.py"), os.path.join(scripts, "design_system.py")]
+    stats = []
+    for path in paths:
+        stat = os.stat(path)
+        stats.append((path, stat.st_mtime_ns, stat.st_size))
+    if stats == _VERSION["stats"]:
+        return _VERSION["version"]
+
+    digest = hashlib.sha1()
+    for path, mtime, size in stats:
+        cached = _DIGESTS.get(path)
+        if not cached or cached[0] != (mtime, size):
+            cached = ((mtime, size), _file_digest(Path(path)))
+            _DIGESTS[path] = cached
+        digest.update(f"{os.path.basename(path)}:{cached[1]}\n".encode("utf-8"))
+    _VERSION.update(stats=stats, version=digest.hexdigest())
+    return _VERSION["version"]
+
+
+class ResultCache:
+    """
+    Content-addressed LRU cache for JSON-serializable results. Keys hash the
+    inputs together with data_version(); entries live in memory (up to `size`)
+    and as JSON files in `directory` (up to `files`, least recently used
+    evicted first) so they survive across CLI runs. When the data version
+    changes, files written for the old one are deleted.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR, size: int = CACHE_SIZE, files: int = CACHE_FILES):
+        self.directory = Path(directory) if directory else None
+        self.size = size
+        self.files = files
+        self.entries = OrderedDict()
+        self.version = None
+
+    def key(self, *parts) -> str:
+        """Cache key for these inputs under the current data version."""
+        version = data_version()
+        if version != self.version:
+            self.version = version
+            self.entries.clear()
+            self._purge()
+        payload = json.dumps([CACHE_VERSION, version, *parts], ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{self.version[:12]}-{key}.json"
+
+    def _files(self) -> list:
+        try:
+            return list(self.directory.glob("*.json"))
+        except OSError:
+            return []
+
+    def _purge(self):
+        """Delete files written for another data version."""
+        if not self.directory:
+            return
+        for path in self._files():
+            if not path.name.startswith(self.version[:12] + "-"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def get(self, key: str):
+        """Cached value or None."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)  # Mark as recently used for disk eviction
+        except (OSError, ValueError):
+            return None
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value):
+        self._remember(key, value)
+        if not self.directory:
+            return
+        # Atomic write; an unwritable data dir just means a memory-only cache
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            return
+        files = self._files()
+        if len(files) > self.files:
+            files.sort(key=lambda path: path.stat().st_mtime_ns)
+            for path in files[:len(files) - self.files]:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def _remember(self, key: str, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry, in memory and on disk."""
+        self.entries.clear()
+        if self.directory:
+            for path in self._files():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+_CACHE = ResultCache()
+
+
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None,
+                           use_cache: bool = True, pages: list = None) -> str:
     """
     Main entry point for design system generation.
 
@@ -471,24 +754,37 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        use_cache: If False, bypass the result cache (no lookup, no store)
+        pages: Optional list of pages to persist in one batch, see persist_pages
 
     Returns:
         Formatted design system string
     """
-    generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    key = _CACHE.key("design_system", query, project_name, output_format) if use_cache else None
+    entry = _CACHE.get(key) if key else None
+    if entry is None:
+        design_system = DesignSystemGenerator().generate(query, project_name)
+        if output_format == "markdown":
+            output = format_markdown(design_system)
+        else:
+            output = format_ascii_box(design_system)
+        entry = {"design_system": design_system, "output": output}
+        if key:
+            _CACHE.put(key, entry)
     
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        if pages:
+            persist_pages(entry["design_system"], ([page] if page else []) + list(pages), output_dir, query, use_cache)
+        else:
+            persist_design_system(entry["design_system"], page, output_dir, query, use_cache)
 
-    if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+    return entry["output"]
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None,
+                          use_cache: bool = True) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
     
@@ -497,10 +793,33 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        use_cache: If False, compute page overrides without the result cache
     
     Returns:
         dict with created file paths and status
     """
+    return persist_pages(design_system, [(page, page_query)] if page else [], output_dir, page_query, use_cache)
+
+
+def persist_pages(design_system: dict, pages: list, output_dir: str = None, default_query: str = None,
+                  use_cache: bool = True) -> dict:
+    """
+    Persist MASTER.md plus one override file per page in a single pass.
+
+    Args:
+        design_system: The generated design system dictionary
+        pages: Page names, (page, query) pairs or {"page": ..., "query": ...} dicts
+        output_dir: Optional output directory (defaults to current working directory)
+        default_query: Query for pages that don't give their own
+        use_cache: If False, compute page overrides without the result cache
+
+    Overrides for every page come from one shared search pass (see
+    _page_overrides_many). Files whose content only differs by the
+    generation timestamp are not rewritten.
+
+    Returns:
+        dict with status, every file path (created_files) and those left as they were (unchanged_files)
+    """
     base_dir = Path(output_dir) if output_dir else Path.cwd()
     
     # Use project name for project-specific folder
@@ -510,35 +829,69 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     design_system_dir = base_dir / "design-system" / project_slug
     pages_dir = design_system_dir / "pages"
     
-    created_files = []
-    
     # Create directories
     design_system_dir.mkdir(parents=True, exist_ok=True)
     pages_dir.mkdir(parents=True, exist_ok=True)
-    
-    master_file = design_system_dir / "MASTER.md"
-    
-    # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
-    created_files.append(str(master_file))
-    
-    # If page is specified, create page override file with intelligent content
-    if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        created_files.append(str(page_file))
+
+    by_file = {pages_dir / filename: entry for filename, entry in normalize_pages(pages, default_query).items()}
+
+    contents = {design_system_dir / "MASTER.md": format_master_md(design_system)}
+    overrides = _page_overrides_many(list(by_file.values()), use_cache)
+    for (page_file, (name, query)), page_overrides in zip(by_file.items(), overrides):
+        contents[page_file] = format_page_override_md(design_system, name, query, use_cache, page_overrides)
+
+    created_files, unchanged_files = [], []
+    for path, content in contents.items():
+        created_files.append(str(path))
+        if not _write_if_changed(path, content):
+            unchanged_files.append(str(path))
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": created_files,
+        "unchanged_files": unchanged_files
     }
 
 
+def normalize_pages(pages: list, default_query: str = None) -> dict:
+    """
+    {override file name: (page, query)} for persist_pages' page entries: names,
+    (page, query) pairs (or JSON lists) and {"page": ..., "query": ...} dicts.
+    Entries without a page name are skipped; a page listed twice keeps its last query.
+    """
+    by_file = {}
+    for entry in pages or []:
+        if isinstance(entry, str):
+            name, query = entry, None
+        elif isinstance(entry, dict):
+            name, query = entry.get("page"), entry.get("query")
+        elif isinstance(entry, (list, tuple)) and entry:
+            name, query = entry[0], entry[1] if len(entry) > 1 else None
+        else:
+            continue
+        if name and isinstance(name, str):
+            by_file[f"{name.lower().replace(' ', '-')}.md"] = (name, query or default_query)
+    return by_file
+
+
+# "**Generated:** <timestamp>" lines, ignored when comparing persisted files
+_GENERATED_RE = re.compile(r"^(> )?\*\*Generated:\*\* .*$", re.MULTILINE)
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Write content to path unless the file already holds it up to the timestamp; True if written."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if _GENERATED_RE.sub("", f.read()) == _GENERATED_RE.sub("", content):
+                return False
+    except OSError:
+        pass
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+
 def format_master_md(design_system: dict) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
     project = design_system.get("project_name", "PROJECT")
@@ -802,14 +1155,16 @@ def format_master_md(design_system: dict) -> str:
     return "\n".join(lines)
 
 
-def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
+def format_page_override_md(design_system: dict, page_name: str, page_query: str = None,
+                            use_cache: bool = True, page_overrides: dict = None) -> str:
     """Format a page-specific override file with intelligent AI-generated content."""
     project = design_system.get("project_name", "PROJECT")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     page_title = page_name.replace("-", " ").replace("_", " ").title()
     
-    # Detect page type and generate intelligent overrides
-    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
+    # Detect page type and generate intelligent overrides (cached per page and query)
+    if page_overrides is None:
+        page_overrides = _page_overrides_many([(page_name, page_query)], use_cache)[0]
     
     lines = []
     
@@ -918,17 +1273,45 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
-    page_lower = page_name.lower()
-    query_lower = (page_query or "").lower()
-    combined_context = f"{page_lower} {query_lower}"
-    
-    # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    combined_context = _override_context(page_name, page_query)
     
+    # Search across multiple domains for page-specific guidance (one scoring pass)
+    searches = get_multi_index().search_many([(domain, combined_context, n) for domain, n in OVERRIDE_SEARCHES])
+    return _build_overrides(combined_context, *searches)
+
+
+def _override_context(page_name: str, page_query: str) -> str:
+    """Search text behind a page's overrides."""
+    return f"{page_name.lower()} {(page_query or '').lower()}"
+
+
+def _page_overrides_many(pages: list, use_cache: bool = True) -> list:
+    """
+    _generate_intelligent_overrides for many (page, query) pairs. Cached
+    overrides are reused; the rest are answered by one search_many call over
+    the shared index, with identical searches (same page context) run once.
+    """
+    overrides = [None] * len(pages)
+    missing = []
+    for i, (page_name, page_query) in enumerate(pages):
+        key = _CACHE.key("page_overrides", page_name, page_query) if use_cache else None
+        overrides[i] = _CACHE.get(key) if key else None
+        if overrides[i] is None:
+            missing.append((i, key, _override_context(page_name, page_query)))
+    if not missing:
+        return overrides
+
+    requests = list(dict.fromkeys((domain, context, n) for _, _, context in missing for domain, n in OVERRIDE_SEARCHES))
+    answers = dict(zip(requests, get_multi_index().search_many(requests)))
+    for i, key, context in missing:
+        overrides[i] = _build_overrides(context, *(answers[(domain, context, n)] for domain, n in OVERRIDE_SEARCHES))
+        if key:
+            _CACHE.put(key, overrides[i])
+    return overrides
+
+
+def _build_overrides(combined_context: str, style_search: dict, ux_search: dict, landing_search: dict) -> dict:
+    """Page overrides from the page's style, UX and landing search results."""
     # Extract results from search response
     style_results = style_search.get("results", [])
     ux_results = ux_search.get("results", [])
@@ -5,6 +5,9 @@ UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --persist [-p "Project Name"] --pages pages.json
+       python search.py --build-index [--force]
+       python search.py --serve   (JSON-lines requests on stdin, one JSON response per line)
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
@@ -12,11 +15,31 @@ Stacks: html-tailwind, react, nextjs
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+  --pages      JSON file listing many pages, e.g. [{"page": "Settings", "query": "account preferences"}, "Reports"];
+               pages without a query use <query>. All overrides come from one shared search pass,
+               and files whose content is unchanged (apart from the timestamp) are not rewritten
+
+Indexes:
+  Each CSV is tokenized once into data/.index/ and rebuilt automatically when
+  the CSV changes. --build-index prebuilds them all (--force to rebuild).
+
+Design system cache:
+  Generated design systems and page overrides are cached in data/.cache/ per
+  query, project, format and data version; any CSV change invalidates them.
+  --no-cache bypasses the cache.
+
+Resident mode (--serve):
+  Keeps every index warm and answers one request per stdin line, e.g.
+    {"id": 1, "query": "fintech dashboard", "domain": "product", "max_results": 3}
+    {"query": "forms", "stack": "react"}
+    {"query": "SaaS dashboard", "design_system": true, "project_name": "App", "format": "markdown"}
+  A line may also hold a list of requests, answered with a list on one line.
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import json
+import sys
+from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack, build_indexes
 
 
 def format_output(result):
@@ -45,9 +68,59 @@ def format_output(result):
     return "\n".join(output)
 
 
+def handle_request(request):
+    """Answer one --serve request dict; errors come back as {"error": ...}"""
+    query = request.get("query")
+    if not query:
+        result = {"error": "Missing query"}
+    elif request.get("design_system"):
+        # Only pay for the generator when it's used
+        from design_system import generate_design_system
+        result = {"design_system": generate_design_system(
+            query,
+            request.get("project_name"),
+            request.get("format", "ascii"),
+            persist=request.get("persist", False),
+            page=request.get("page"),
+            output_dir=request.get("output_dir"),
+            use_cache=request.get("cache", True),
+            pages=request.get("pages")
+        )}
+    elif request.get("stack"):
+        result = search_stack(query, request["stack"], request.get("max_results", MAX_RESULTS))
+    else:
+        domain = request.get("domain")
+        if domain is not None and domain not in CSV_CONFIG:
+            result = {"error": f"Unknown domain: {domain}. Available: {', '.join(CSV_CONFIG)}"}
+        else:
+            result = search(query, domain, request.get("max_results", MAX_RESULTS))
+    if "id" in request:
+        result = {"id": request["id"], **result}
+    return result
+
+
+def serve(stdin=sys.stdin, stdout=sys.stdout):
+    """Resident JSON-lines loop: indexes are loaded once and stay warm between requests"""
+    build_indexes()
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            if isinstance(request, list):
+                response = [handle_request(r) for r in request]
+            else:
+                response = handle_request(request)
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+        stdout.flush()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
@@ -59,19 +132,39 @@ if __name__ == "__main__":
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
+    parser.add_argument("--pages", type=str, default=None, help="JSON file with a list of pages (and queries) to persist in one batch")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    parser.add_argument("--no-cache", action="store_true", help="Generate the design system without the result cache")
+    # Index maintenance
+    parser.add_argument("--build-index", action="store_true", help="Prebuild the search index of every domain and stack")
+    parser.add_argument("--force", action="store_true", help="With --build-index, rebuild even if indexes are fresh")
+    parser.add_argument("--serve", action="store_true", help="Resident mode: answer JSON-lines requests from stdin")
 
     args = parser.parse_args()
+    if not args.query and not (args.build_index or args.serve):
+        parser.error("the following arguments are required: query")
 
+    if args.serve:
+        serve()
+    elif args.build_index:
+        built = build_indexes(force=args.force)
+        print(f"Indexed {len(built)} files")
     # Design system takes priority
-    if args.design_system:
+    elif args.design_system:
+        from design_system import generate_design_system, normalize_pages
+        pages = None
+        if args.pages:
+            with open(args.pages, 'r', encoding='utf-8') as f:
+                pages = json.load(f)
         result = generate_design_system(
             args.query, 
             args.project_name, 
             args.format,
             persist=args.persist,
             page=args.page,
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            use_cache=not args.no_cache,
+            pages=pages
         )
         print(result)
         
@@ -84,6 +177,8 @@ if __name__ == "__main__":
             if args.page:
                 page_filename = args.page.lower().replace(' ', '-')
                 print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
+            for filename in normalize_pages(pages):
+                print(f"   📄 design-system/{project_slug}/pages/{filename} (Page Overrides)")
             print("")
             print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
             print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
@@ -92,7 +187,6 @@ if __name__ == "__main__":
     elif args.stack:
         result = search_stack(args.query, args.stack, args.max_results)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
@@ -100,7 +194,6 @@ if __name__ == "__main__":
     else:
         result = search(args.query, args.domain, args.max_results)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
@@ -0,0 +1,196 @@
+import os
+import time
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from numeric import parse_number, EN_US
+
+# brapi.dev quote client. brapi accepts comma-separated symbols in
+# /quote/{A,B,C}, so tickers are packed into the largest batches the plan
+# allows and the batches run concurrently under the token's rate limit.
+
+BASE_URL = "https://brapi.dev/api"
+TOKEN = os.environ.get('BRAPI_TOKEN')
+
+# Plan limits (override via env for paid tokens)
+BATCH_SIZE = int(os.environ.get('BRAPI_BATCH_SIZE', 20))
+REQUESTS_PER_MINUTE = int(os.environ.get('BRAPI_REQUESTS_PER_MINUTE', 60))
+MAX_WORKERS = 4
+LIST_PAGE_SIZE = 500
+
+# v1 nests dividends in dividendsData.cashDividends and wants dividends=true;
+# v2 (probed in test_brapi_v2_*.py) uses extra=dividends and a flat list.
+ENDPOINTS = {
+    'v1': {'path': '/quote/{symbols}', 'dividends': {'dividends': 'true'}},
+    'v2': {'path': '/v2/quote/{symbols}', 'dividends': {'extra': 'dividends'}},
+}
+
+
+class RateLimiter:
+    """Spaces out calls so no more than `per_minute` start in any minute."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def clean_symbol(ticker):
+    return ticker.replace('.SA', '').upper()
+
+
+def chunk(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _normalize_dividends(result):
+    """Flatten v1 `dividendsData.cashDividends` and v2 `dividends` into one shape."""
+    events = (result.get('dividendsData') or {}).get('cashDividends') or result.get('dividends') or []
+    dividends = []
+    for d in events:
+        dividends.append({
+            'type': d.get('label') or d.get('type') or 'Dividendo',
+            'dateCom': (d.get('lastDatePrior') or d.get('declarationDate') or d.get('date') or '')[:10],
+            'paymentDate': (d.get('paymentDate') or '')[:10],
+            'value': parse_number(d.get('rate', d.get('value')), EN_US),
+        })
+    return dividends
+
+
+def normalize_quote(result):
+    """Map a brapi quote result (v1 or v2) to the scraper's field names."""
+    return {
+        'ticker': result.get('symbol'),
+        'name': result.get('longName') or result.get('shortName') or result.get('symbol'),
+        'price': parse_number(result.get('regularMarketPrice'), EN_US),
+        'change': parse_number(result.get('regularMarketChangePercent'), EN_US),
+        'market_cap': parse_number(result.get('marketCap'), EN_US),
+        'volume': parse_number(result.get('regularMarketVolume'), EN_US),
+        'updated_at': result.get('regularMarketTime'),
+        'dividends': _normalize_dividends(result),
+    }
+
+
+class BrapiClient:
+    """Batched, rate-limited brapi quote client."""
+
+    def __init__(self, token=TOKEN, version='v1', batch_size=BATCH_SIZE,
+                 requests_per_minute=REQUESTS_PER_MINUTE, max_workers=MAX_WORKERS):
+        self.token = token
+        self.version = version
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(requests_per_minute)
+        self.session = requests.Session()
+
+    def _get(self, symbols, dividends, version):
+        endpoint = ENDPOINTS[version]
+        params = {'token': self.token} if self.token else {}
+        if dividends:
+            params.update(endpoint['dividends'])
+        url = BASE_URL + endpoint['path'].format(symbols=','.join(symbols))
+
+        for attempt in range(3):
+            self.limiter.wait()
+            response = self.session.get(url, params=params, timeout=30)
+            if response.status_code == 429:
+                time.sleep(2 ** attempt)
+                continue
+            return response
+        return response
+
+    def _fetch_batch(self, symbols, dividends):
+        """Fetch one batch, degrading gracefully instead of losing the whole batch."""
+        try:
+            response = self._get(symbols, dividends, self.version)
+            if response.status_code == 404 and self.version != 'v1':
+                response = self._get(symbols, dividends, 'v1')
+        except requests.RequestException as e:
+            print(f"brapi request failed for {','.join(symbols)}: {e}")
+            return {}
+
+        payload = {}
+        try:
+            payload = response.json()
+        except ValueError:
+            pass
+
+        if response.status_code == 200 and not payload.get('error'):
+            return {q['ticker']: q for q in map(normalize_quote, payload.get('results', [])) if q['ticker']}
+
+        # Plan without the dividends module: keep the prices at least
+        if dividends and payload.get('code') == 'MODULES_NOT_AVAILABLE':
+            return self._fetch_batch(symbols, False)
+
+        # One unknown ticker fails the whole request, so bisect to isolate it
+        if response.status_code in (400, 404) and len(symbols) > 1:
+            mid = len(symbols) // 2
+            quotes = self._fetch_batch(symbols[:mid], dividends)
+            quotes.update(self._fetch_batch(symbols[mid:], dividends))
+            return quotes
+
+        print(f"brapi error {response.status_code} for {','.join(symbols)}: {payload.get('message', '')}")
+        return {}
+
+    def _list_page(self, asset_type, page):
+        params = {'type': asset_type, 'page': page, 'limit': LIST_PAGE_SIZE}
+        if self.token:
+            params['token'] = self.token
+        self.limiter.wait()
+        try:
+            response = self.session.get(BASE_URL + '/quote/list', params=params, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"brapi listing failed for {asset_type} page {page}: {e}")
+            return None
+
+    def list_assets(self, asset_type):
+        """
+        Full brapi listing for one type ('stock', 'fund', 'bdr'), pages fetched
+        concurrently. Returns [] unless every page came back, so callers never
+        mistake a partial listing for delistings.
+        """
+        first = self._list_page(asset_type, 1)
+        if not first:
+            return []
+        rows = list(first.get('stocks', []))
+        pages = range(2, int(first.get('totalPages') or 1) + 1)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for payload in pool.map(lambda p: self._list_page(asset_type, p), pages):
+                if payload is None:
+                    return []
+                rows.extend(payload.get('stocks', []))
+        return rows
+
+    def quotes(self, tickers, dividends=False):
+        """Return {ticker: quote} for all tickers using as few requests as possible."""
+        symbols = list(dict.fromkeys(clean_symbol(t) for t in tickers))
+        batches = chunk(symbols, self.batch_size)
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for batch_quotes in pool.map(lambda b: self._fetch_batch(b, dividends), batches):
+                results.update(batch_quotes)
+        return results
+
+
+def get_quotes(tickers, dividends=False, **kwargs):
+    return BrapiClient(**kwargs).quotes(tickers, dividends)
+
+
+if __name__ == "__main__":
+    import sys
+    tickers = sys.argv[1:] or ['PETR4', 'VALE3', 'ITUB4', 'MXRF11']
+    start = time.perf_counter()
+    quotes = get_quotes(tickers)
+    for symbol, q in quotes.items():
+        print(f"{symbol:<8} R$ {q['price']:>10.2f}  {q['change']:+.2f}%  {q['name']}")
+    print(f"{len(quotes)}/{len(tickers)} quotes in {time.perf_counter() - start:.2f}s")
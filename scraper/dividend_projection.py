@@ -0,0 +1,142 @@
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from scheduler import SUPABASE_URL, SUPABASE_KEY, fetch_rows
+
+# 12-month forward dividend projections for many portfolios at once. Every
+# dividend event in the dataset is flattened into arrays and folded into a
+# (tickers x 12 calendar months) seasonal profile of expected payment per
+# share; projecting all portfolios is then one (portfolios x tickers) @
+# (tickers x 12) product.
+
+LOOKBACK_YEARS = 3
+
+
+def build_profiles(results, now=None, lookback_years=LOOKBACK_YEARS):
+    """
+    Return (tickers, profile) where profile[t, m] is the average dividend per
+    share paid in calendar month m+1 over the lookback window. Tickers with a
+    shorter history are averaged over the years they actually have.
+    """
+    now = pd.Timestamp(now or datetime.now())
+    tickers = [res['ticker'] for res in results]
+    ticker_idx, dates, values = [], [], []
+    for i, res in enumerate(results):
+        for d in res.get('dividends', []):
+            ticker_idx.append(i)
+            dates.append(d.get('paymentDate') or d.get('dateCom'))
+            values.append(d.get('value') or 0.0)
+
+    profile = np.zeros((len(tickers), 12))
+    if not dates:
+        return tickers, profile
+
+    ticker_idx = np.array(ticker_idx)
+    dates = pd.to_datetime(pd.Series(dates), format='%d/%m/%Y', errors='coerce')
+    values = np.array(values, dtype=float)
+    start = now - pd.DateOffset(years=lookback_years)
+    in_window = (dates > start).to_numpy() & (dates <= now).to_numpy()
+
+    months = dates.dt.month.to_numpy()
+    np.add.at(profile, (ticker_idx[in_window], months[in_window].astype(int) - 1), values[in_window])
+
+    # Years of history each ticker has inside the window (at least one)
+    first = pd.Series(dates[in_window].to_numpy()).groupby(ticker_idx[in_window]).min()
+    years = np.full(len(tickers), float(lookback_years))
+    span = ((now - first).dt.days / 365.25).clip(lower=1, upper=lookback_years)
+    years[first.index.to_numpy()] = np.ceil(span.to_numpy())
+    return tickers, profile / years[:, None]
+
+
+def holdings_matrix(portfolios, tickers):
+    """(portfolios x tickers) quantity matrix from [{'id', 'holdings': {ticker: qty}}]."""
+    column = {t: j for j, t in enumerate(tickers)}
+    matrix = np.zeros((len(portfolios), len(tickers)))
+    for i, portfolio in enumerate(portfolios):
+        for ticker, quantity in portfolio['holdings'].items():
+            j = column.get(ticker.upper().replace('.SA', ''))
+            if j is not None:
+                matrix[i, j] += quantity
+    return matrix
+
+
+def project(holdings, profile, now=None):
+    """
+    (portfolios x 12) projected cash flow for the next 12 months, starting
+    next month, plus the matching 'YYYY-MM' labels.
+    """
+    now = pd.Timestamp(now or datetime.now())
+    months = pd.period_range(now.to_period('M') + 1, periods=12, freq='M')
+    order = months.month.to_numpy() - 1
+    return holdings @ profile[:, order], [str(m) for m in months]
+
+
+def project_portfolios(portfolios, results, now=None):
+    """{portfolio id: {'months', 'values', 'total'}} for every portfolio."""
+    tickers, profile = build_profiles(results, now)
+    cash_flows, months = project(holdings_matrix(portfolios, tickers), profile, now)
+    cash_flows = cash_flows.round(2)
+    return {
+        portfolio['id']: {'months': months, 'values': row.tolist(), 'total': round(float(row.sum()), 2)}
+        for portfolio, row in zip(portfolios, cash_flows)
+    }
+
+
+def load_portfolios():
+    """One portfolio per user from Supabase wallets/wallet_assets (needs the service role key)."""
+    if not (SUPABASE_URL and SUPABASE_KEY):
+        return []
+    portfolios = {}
+    for row in fetch_rows('wallet_assets', 'symbol,quantity,wallets(user_id)'):
+        user_id = (row.get('wallets') or {}).get('user_id')
+        if user_id:
+            holdings = portfolios.setdefault(user_id, {})
+            symbol = row['symbol'].upper()
+            holdings[symbol] = holdings.get(symbol, 0) + float(row.get('quantity') or 0)
+    return [{'id': user_id, 'holdings': holdings} for user_id, holdings in portfolios.items()]
+
+
+def benchmark(results, n_portfolios=10000, assets_per_portfolio=15):
+    """Time profile building and projecting `n_portfolios` random portfolios."""
+    rng = np.random.default_rng(0)
+    tickers = [res['ticker'] for res in results]
+    portfolios = [
+        {'id': i, 'holdings': {t: int(rng.integers(1, 1000))
+                               for t in rng.choice(tickers, min(assets_per_portfolio, len(tickers)), replace=False)}}
+        for i in range(n_portfolios)
+    ]
+    start = time.perf_counter()
+    _, profile = build_profiles(results)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    matrix = holdings_matrix(portfolios, tickers)
+    project(matrix, profile)
+    projected = time.perf_counter() - start
+    print(f"{len(tickers)} tickers, {n_portfolios} portfolios: profiles {built * 1000:.1f} ms, "
+          f"holdings + projection {projected * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from fetch_investments import OUTPUT_FILE
+    from writer import write_json
+
+    parser = argparse.ArgumentParser(description="12-month dividend projections for user portfolios")
+    parser.add_argument("--output", help="Write projections for every Supabase portfolio to this JSON file")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Benchmark with N random portfolios")
+    args = parser.parse_args()
+
+    with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+
+    if args.benchmark:
+        benchmark(results, args.benchmark)
+    else:
+        portfolios = load_portfolios()
+        projections = project_portfolios(portfolios, results)
+        if args.output:
+            # Per-user data: keep it out of public/
+            write_json(projections, args.output)
+        print(f"Projected {len(projections)} portfolios")
@@ -1,4 +1,5 @@
 import yfinance as yf
+import argparse
 import json
 import os
 import time
@@ -6,8 +7,19 @@ import pandas as pd
 import numpy as np
 import yahoo_fin.stock_info as si
 from datetime import datetime
+from numeric import parse_number, EN_US
+from brapi import get_quotes
+from universe import discover, traded_value
+from scheduler import build_table, plan, load_holdings
+from journal import (new_journal_path, unfinished_journal, read_journal, open_journal, append_record,
+                     finish_journal, prune_journals)
+from writer import write_json_array, write_ndjson, write_json
+from history import append_snapshot, save_returns
+from screener import publish_screens, load_table
+from valuation import publish_valuations
+from indicators import extract_fundamentals, load_fundamentals, save_fundamentals, apply_ratios
 
-# List of assets to track
+# Seed list, used when the B3 listing and the existing dataset are both unavailable
 ASSETS = [
     'PETR4.SA', 'VALE3.SA', 'ITUB4.SA', 'BBAS3.SA', 'WEGE3.SA', 
     'ABEV3.SA', 'B3SA3.SA', 'EGIE3.SA', 'SANB11.SA', 'FLRY3.SA',
@@ -18,7 +30,15 @@ ASSETS = [
     'ALZR11.SA', 'HGRU11.SA', 'BTLG11.SA', 'TRXF11.SA', 'CPTS11.SA'
 ]
 
-def get_asset_details(ticker):
+OUTPUT_FILE = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'investments.json')
+NDJSON_FILE = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'investments.ndjson')
+SEGMENTS_FILE = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'segments.json')
+
+# Full fetches per nightly run (~4s each). The scheduler spends them on held,
+# liquid and stale tickers first, so the run fits the job's time budget
+FETCH_BUDGET = 600
+
+def get_asset_details(ticker, listed_type=None):
     print(f"Fetching ADVANCED data for {ticker}...")
     try:
         stock = yf.Ticker(ticker)
@@ -28,6 +48,9 @@ def get_asset_details(ticker):
         asset_type = 'fii' if '11.SA' in ticker and ('FII' in info.get('longName', '').upper() or 'FUNDO' in info.get('longName', '').upper()) else 'acao'
         if '11.SA' in ticker and asset_type == 'acao': 
              asset_type = 'fii'
+        if listed_type:
+            # The B3 listing knows the real type (units and BDRs are shown as stocks)
+            asset_type = 'fii' if listed_type == 'fii' else 'acao'
 
         price = info.get('currentPrice') or info.get('regularMarketPrice') or 0.0
         
@@ -80,22 +103,14 @@ def get_asset_details(ticker):
             if market_cap == 0 or ebitda_val == 0:
                 quote = si.get_quote_table(ticker)
                 if market_cap == 0:
-                    mc_str = quote.get('Market Cap', '0')
-                    # Convert '1.2B' or '500M' to numbers if needed
-                    if isinstance(mc_str, str):
-                        if 'T' in mc_str: market_cap = float(mc_str.replace('T', '')) * 1e12
-                        elif 'B' in mc_str: market_cap = float(mc_str.replace('B', '')) * 1e9
-                        elif 'M' in mc_str: market_cap = float(mc_str.replace('M', '')) * 1e6
+                    # yahoo_fin returns strings like '1.2B' or '500M'
+                    market_cap = parse_number(quote.get('Market Cap'), EN_US)
                 
                 stats = si.get_stats(ticker)
                 if ebitda_val == 0:
                     ebitda_row = stats[stats['Attribute'].str.contains('EBITDA', na=False)]
                     if not ebitda_row.empty:
-                        ebitda_val = ebitda_row.iloc[0]['Value']
-                        # Handle strings like '1.2B'
-                        if isinstance(ebitda_val, str):
-                            if 'B' in ebitda_val: ebitda_val = float(ebitda_val.replace('B', '')) * 1e9
-                            elif 'M' in ebitda_val: ebitda_val = float(ebitda_val.replace('M', '')) * 1e6
+                        ebitda_val = parse_number(ebitda_row.iloc[0]['Value'], EN_US)
         except:
             pass
 
@@ -125,9 +140,19 @@ def get_asset_details(ticker):
         # --- Historical Data (10 Years) ---
         chart_data = []
         dividends_list = []
-        
+        monthly_returns = None
+
         hist = stock.history(period="10y")
         if not hist.empty:
+            # Monthly total returns (Close is dividend-adjusted) for the retirement simulator
+            closes = hist['Close'].groupby(hist.index.tz_localize(None).to_period('M')).last()
+            returns = closes.pct_change().iloc[1:].replace([np.inf, -np.inf], np.nan).fillna(0.0)
+            if not returns.empty:
+                monthly_returns = {
+                    'start': str(returns.index[0]),
+                    'returns': [round(float(r), 4) for r in returns],
+                }
+
             hist['Year'] = hist.index.year
             # Yearly sums
             yearly = hist.groupby('Year').agg({
@@ -164,6 +189,8 @@ def get_asset_details(ticker):
 
         data = {
             'ticker': ticker.replace('.SA', ''),
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'shares_outstanding': safe_round(papers),
             'type': asset_type,
             'price': safe_round(price),
             'name': info.get('longName') or info.get('shortName') or ticker,
@@ -195,20 +222,72 @@ def get_asset_details(ticker):
             'chartData': chart_data,
             'dividends': dividends_list
         }
+        if monthly_returns:
+            # Moved into history/ by save_returns, never published in investments.json
+            data['monthly_returns'] = monthly_returns
         return data
 
     except Exception as e:
         print(f"Error fetching {ticker}: {e}")
         return None
 
-def main():
-    results = []
+def load_results():
+    if not os.path.exists(OUTPUT_FILE):
+        return []
+    with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def journal_records(path, existing):
+    """Journal records newer than the dataset's; older ones come from a run whose output was already saved."""
+    return {t: rec for t, rec in read_journal(path).items()
+            if (rec.get('updated_at') or '') > (existing.get(t, {}).get('updated_at') or '')}
+
+def main(budget=FETCH_BUDGET, resume=False, ndjson=False):
     print("Starting Comprehensive Import...")
-    for asset in ASSETS:
-        data = get_asset_details(asset)
-        if data:
-            results.append(data)
-        time.sleep(1) # Be polite
+    existing = {res['ticker']: res for res in load_results()}
+    universe, new, removed = discover(existing)
+    for ticker in removed:
+        existing.pop(ticker, None)
+
+    # Each finished ticker is checkpointed, so a crashed or timed-out run can
+    # --resume: the unfinished journal is picked up whatever day it started on
+    path = unfinished_journal() if resume else None
+    done = journal_records(path, existing) if path else {}
+    if path:
+        print(f"Resuming: {len(done)} tickers already in {os.path.basename(path)}")
+    else:
+        path = new_journal_path()
+
+    candidates = list(existing) + new
+    if not candidates:
+        candidates = [asset.replace('.SA', '') for asset in ASSETS]
+    # R$/day for both: listing volume is a share count, so it is converted with the last close
+    liquidity = {t: traded_value(universe[t]) for t in new}
+    liquidity.update({t: res['indicators'].get('liquidez_media_diaria') for t, res in existing.items()})
+    last_updated = {t: res.get('updated_at') for t, res in existing.items()}
+    # Tickers already fetched by the resumed run count as fresh, so the budget goes to the rest
+    last_updated.update({t: rec.get('updated_at') for t, rec in done.items()})
+    table = build_table(
+        candidates,
+        holdings=load_holdings(),
+        liquidity=liquidity,
+        last_updated=last_updated,
+    )
+    tickers = plan(table, budget)
+    print(f"Fetching {len(tickers)}/{len(candidates)} tickers ({len(new)} never fetched)")
+
+    with open_journal(path, resume) as journal:
+        for ticker in tickers:
+            if ticker in done:
+                continue
+            data = get_asset_details(f"{ticker}.SA", universe.get(ticker, {}).get('type'))
+            if data:
+                append_record(journal, data)
+            time.sleep(1) # Be polite
+
+    # Output is assembled from the journal; tickers that failed keep their previous record
+    fetched = journal_records(path, existing)
+    results = list({**existing, **fetched}.values())
         
     # --- Aggregation Logic (ON/PN Summation) ---
     # Group by prefix (4 letters) and sum ON/PN classes (3, 4, 5, 6, 7, 8)
@@ -220,7 +299,8 @@ def main():
             prefix = ticker[:4]
             suffix = ticker[4:]
             if suffix in ['3', '4', '5', '6', '7', '8']:
-                shares = res['indicators'].get('numero_papeis', 0)
+                # Records kept from earlier runs already hold the summed total
+                shares = res.get('shares_outstanding', res['indicators'].get('numero_papeis', 0))
                 prefix_shares[prefix] = prefix_shares.get(prefix, 0) + shares
 
     # Apply aggregated totals and update Market Cap
@@ -236,11 +316,100 @@ def main():
                 if res['price'] > 0:
                     res['indicators']['market_cap'] = res['price'] * total_shares
 
-    output_dir = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
-    os.makedirs(output_dir, exist_ok=True)
-    with open(os.path.join(output_dir, 'investments.json'), 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    # Store raw fundamentals and derive the price ratios locally, so intraday
+    # price refreshes produce the same numbers without calling `info` again
+    fundamentals = extract_fundamentals(results)
+    save_fundamentals(fundamentals)
+    apply_ratios(results, fundamentals)
+
+    save_returns(results)
+    save_results(results, ndjson)
+    publish_derived(results)
+    # Only tickers fetched by this run are observations for today's snapshot
+    append_snapshot(results, tickers=fetched)
+    finish_journal(path)
+    prune_journals()
     print("Done!")
 
+def save_results(results, ndjson=False):
+    # Streamed to a temp file and renamed, so a crash never leaves a corrupt dataset
+    write_json_array(results, OUTPUT_FILE)
+    if ndjson:
+        write_ndjson(results, NDJSON_FILE)
+
+def compute_segment_stats(results):
+    """
+    Per-segment count, quartiles and median of every indicator, in one grouped
+    pass. Keyed by segment name so comparing an asset with its peers is a
+    single lookup on the client. Unavailable (0.0) indicators are ignored.
+    """
+    table = load_table(results)
+    if table.empty or 'segment' not in table:
+        return {}
+    numeric = table.select_dtypes('number').columns.drop('price', errors='ignore')
+    grouped = table.groupby('segment', observed=True)[numeric]
+    counts = grouped.count()
+    quartiles = grouped.quantile([0.25, 0.5, 0.75])
+
+    stats = {}
+    for segment, count in table['segment'].value_counts().items():
+        if not count:
+            continue
+        q = quartiles.loc[segment]
+        stats[segment] = {'count': int(count), 'indicators': {}}
+        for col in numeric:
+            if counts.at[segment, col]:
+                stats[segment]['indicators'][col] = {
+                    'count': int(counts.at[segment, col]),
+                    'p25': round(float(q.at[0.25, col]), 2),
+                    'median': round(float(q.at[0.5, col]), 2),
+                    'p75': round(float(q.at[0.75, col]), 2),
+                }
+    return stats
+
+def publish_derived(results):
+    """Side files derived from the dataset: preset screens, segment aggregates and fair values."""
+    publish_screens(results)
+    publish_valuations(results)
+    write_json(compute_segment_stats(results), SEGMENTS_FILE)
+
+def fetch_prices(tickers):
+    """Latest prices for all tickers: brapi batches first, one yfinance download for the rest."""
+    prices = {t: q['price'] for t, q in get_quotes(tickers).items() if q['price'] > 0}
+    missing = [t for t in tickers if t not in prices]
+    if missing:
+        try:
+            closes = yf.download([f"{t}.SA" for t in missing], period='5d', progress=False)['Close']
+            for t in missing:
+                col = closes.get(f"{t}.SA") if isinstance(closes, pd.DataFrame) else closes
+                if col is not None and not col.dropna().empty:
+                    prices[t] = float(col.dropna().iloc[-1])
+        except Exception as e:
+            print(f"yfinance fallback failed: {e}")
+    return prices
+
+def refresh_prices(ndjson=False):
+    """Patch price, market cap and price-dependent ratios in the existing dataset."""
+    with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+
+    fundamentals = load_fundamentals() or extract_fundamentals(results)
+    prices = fetch_prices([res['ticker'] for res in results])
+    apply_ratios(results, fundamentals, prices)
+
+    save_results(results, ndjson)
+    publish_derived(results)
+    print(f"Updated prices for {len(prices)}/{len(results)} assets.")
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="FinAI investment data scraper")
+    parser.add_argument("--budget", type=int, default=FETCH_BUDGET, help="Max full fetches in this run (see scheduler.py)")
+    parser.add_argument("--resume", action="store_true", help="Continue the last unfinished run's journal, skipping the tickers it already fetched")
+    parser.add_argument("--ndjson", action="store_true", help="Also write public/data/investments.ndjson (one asset per line)")
+    parser.add_argument("--prices-only", action="store_true", help="Only refresh prices and price-dependent ratios in the existing dataset")
+    args = parser.parse_args()
+
+    if args.prices_only:
+        refresh_prices(args.ndjson)
+    else:
+        main(args.budget, args.resume, args.ndjson)
@@ -0,0 +1,199 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+from writer import atomic_write, write_json
+
+# Indicator history. Each run's indicator vectors are stored as one float32
+# matrix per day (rows = tickers, columns = indicators) in date-partitioned
+# .npy files. index.json maps tickers and indicators to rows/columns and only
+# ever grows, so old partitions never need rewriting and stay memory-mappable.
+
+HISTORY_DIR = os.path.join(os.path.dirname(__file__), 'history')
+INDEX_FILE = 'index.json'
+
+
+def _load_index(directory):
+    path = os.path.join(directory, INDEX_FILE)
+    if not os.path.exists(path):
+        return {'tickers': [], 'indicators': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _partition_path(directory, day):
+    return os.path.join(directory, str(day.year), f"{day.isoformat()}.npy")
+
+
+def _to_date(value):
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def append_snapshot(results, day=None, directory=HISTORY_DIR, tickers=None):
+    """
+    Store the day's price + indicators. With `tickers`, only those assets
+    (the ones actually fetched this run) are recorded; records carried over
+    from earlier runs stay NaN for the day instead of repeating stale values.
+    Re-running on the same day updates that day's rows.
+    """
+    day = _to_date(day) or date.today()
+    if tickers is not None:
+        tickers = set(tickers)
+        results = [res for res in results if res['ticker'] in tickers]
+    index = _load_index(directory)
+    rows = {t: i for i, t in enumerate(index['tickers'])}
+    cols = {c: i for i, c in enumerate(index['indicators'])}
+
+    for res in results:
+        if res['ticker'] not in rows:
+            rows[res['ticker']] = len(index['tickers'])
+            index['tickers'].append(res['ticker'])
+        for name in ['price', *res.get('indicators', {})]:
+            if name not in cols:
+                cols[name] = len(index['indicators'])
+                index['indicators'].append(name)
+
+    matrix = np.full((len(index['tickers']), len(index['indicators'])), np.nan, dtype=np.float32)
+    path = _partition_path(directory, day)
+    if os.path.exists(path):
+        previous = np.load(path)
+        matrix[:previous.shape[0], :previous.shape[1]] = previous
+    for res in results:
+        row = rows[res['ticker']]
+        matrix[row] = np.nan
+        values = {'price': res.get('price'), **res.get('indicators', {})}
+        for name, value in values.items():
+            if isinstance(value, (int, float)):
+                matrix[row, cols[name]] = value
+
+    write_json(index, os.path.join(directory, INDEX_FILE))
+    with atomic_write(path, binary=True) as f:
+        np.save(f, matrix)
+
+
+def available_dates(start=None, end=None, directory=HISTORY_DIR):
+    """Sorted partition dates within [start, end]."""
+    start, end = _to_date(start), _to_date(end)
+    days = []
+    if not os.path.isdir(directory):
+        return days
+    for year in os.listdir(directory):
+        if not year.isdigit() or (start and int(year) < start.year) or (end and int(year) > end.year):
+            continue
+        for name in os.listdir(os.path.join(directory, year)):
+            if name.endswith('.npy'):
+                day = date.fromisoformat(name[:-4])
+                if (not start or day >= start) and (not end or day <= end):
+                    days.append(day)
+    return sorted(days)
+
+
+def query(tickers=None, indicators=None, start=None, end=None, directory=HISTORY_DIR):
+    """
+    History as a float32 cube: returns (dates, tickers, indicators, values)
+    with values shaped (len(dates), len(tickers), len(indicators)). Tickers
+    or indicators missing on a given day come back as NaN.
+    """
+    index = _load_index(directory)
+    tickers = list(tickers) if tickers is not None else index['tickers']
+    indicators = list(indicators) if indicators is not None else index['indicators']
+    rows = {t: i for i, t in enumerate(index['tickers'])}
+    cols = {c: i for i, c in enumerate(index['indicators'])}
+    row_idx = np.array([rows.get(t, -1) for t in tickers], dtype=np.int64)
+    col_idx = np.array([cols.get(c, -1) for c in indicators], dtype=np.int64)
+
+    days = available_dates(start, end, directory)
+    values = np.full((len(days), len(tickers), len(indicators)), np.nan, dtype=np.float32)
+    for i, day in enumerate(days):
+        matrix = np.load(_partition_path(directory, day), mmap_mode='r')
+        # Partitions written before a ticker/indicator existed are smaller
+        r_ok = (row_idx >= 0) & (row_idx < matrix.shape[0])
+        c_ok = (col_idx >= 0) & (col_idx < matrix.shape[1])
+        values[i][np.ix_(r_ok, c_ok)] = matrix[np.ix_(row_idx[r_ok], col_idx[c_ok])]
+    return days, tickers, indicators, values
+
+
+def ticker_history(ticker, indicators=None, start=None, end=None, directory=HISTORY_DIR):
+    """DataFrame of dates x indicators for one ticker."""
+    days, _, indicators, values = query([ticker], indicators, start, end, directory)
+    return pd.DataFrame(values[:, 0, :], index=pd.DatetimeIndex(days, name='date'), columns=indicators)
+
+
+def indicator_history(indicator, tickers=None, start=None, end=None, directory=HISTORY_DIR):
+    """DataFrame of dates x tickers for one indicator."""
+    days, tickers, _, values = query(tickers, [indicator], start, end, directory)
+    return pd.DataFrame(values[:, :, 0], index=pd.DatetimeIndex(days, name='date'), columns=tickers)
+
+
+def percentile_bands(ticker, indicator, start=None, end=None, percentiles=(10, 25, 50, 75, 90),
+                     directory=HISTORY_DIR):
+    """
+    Historical percentile bands of one indicator for one ticker, plus where
+    the latest value sits (0-100) within its own history. Zeros are treated
+    as missing, matching how the scraper fills unavailable indicators.
+    """
+    series = ticker_history(ticker, [indicator], start, end, directory)[indicator]
+    series = series[series.notna() & (series != 0)]
+    if series.empty:
+        return {}
+    values = series.to_numpy(dtype=np.float64)
+    bands = {f"p{p}": round(float(v), 2) for p, v in zip(percentiles, np.percentile(values, percentiles))}
+    current = values[-1]
+    bands.update({
+        'current': round(float(current), 2),
+        'percentile_rank': round(float((values < current).mean() * 100), 1),
+        'observations': int(len(values)),
+        'start': series.index[0].date().isoformat(),
+        'end': series.index[-1].date().isoformat(),
+    })
+    return bands
+
+
+RETURNS_FILE = os.path.join(HISTORY_DIR, 'monthly_returns.json')
+
+
+def load_returns(path=RETURNS_FILE):
+    """{ticker: {'start': 'YYYY-MM', 'returns': [...]}} of monthly total returns."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_returns(results, path=RETURNS_FILE):
+    """
+    Move the 'monthly_returns' series out of freshly fetched records and merge
+    them into the returns store. Tickers not refreshed this run keep their
+    previous series, and the published dataset never carries them.
+    """
+    fresh = {res['ticker']: res.pop('monthly_returns') for res in results if 'monthly_returns' in res}
+    if fresh:
+        stored = load_returns(path)
+        stored.update(fresh)
+        write_json(stored, path, sort_keys=True)
+    return fresh
+
+
+def returns_matrix(tickers=None, path=RETURNS_FILE):
+    """
+    Align stored series on a common monthly calendar: returns (months,
+    tickers, values) with values shaped (len(months), len(tickers)) and NaN
+    where a ticker has no data for that month.
+    """
+    stored = load_returns(path)
+    tickers = [t for t in (tickers if tickers is not None else sorted(stored)) if t in stored]
+    if not tickers:
+        return pd.PeriodIndex([], freq='M'), [], np.empty((0, 0))
+    starts = {t: pd.Period(stored[t]['start'], freq='M') for t in tickers}
+    first = min(starts.values())
+    last = max(starts[t] + len(stored[t]['returns']) - 1 for t in tickers)
+    months = pd.period_range(first, last, freq='M')
+    values = np.full((len(months), len(tickers)), np.nan)
+    for j, t in enumerate(tickers):
+        offset = (starts[t] - first).n
+        series = stored[t]['returns']
+        values[offset:offset + len(series), j] = series
+    return months, tickers, values
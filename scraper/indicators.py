@@ -0,0 +1,104 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from writer import write_json
+
+# Price-dependent indicators (P/L, P/VP, DY, EV/EBITDA, market cap) are
+# recomputed locally from raw fundamentals stored once per full run, so a
+# new price never needs another yfinance `info` call.
+
+FUNDAMENTALS_FILE = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'fundamentals.json')
+
+FUNDAMENTAL_FIELDS = ['lpa', 'vpa', 'dividendos_12m', 'ebitda', 'divida_liquida', 'numero_papeis']
+RATIO_FIELDS = ['pl', 'pvp', 'dy', 'p_ebitda', 'market_cap']
+
+
+def trailing_dividends(dividends, now=None):
+    """Sum of dividend events with dateCom in the last 12 months."""
+    now = now or datetime.now()
+    total = 0.0
+    for d in dividends:
+        try:
+            date = datetime.strptime(d.get('dateCom', ''), '%d/%m/%Y')
+        except ValueError:
+            continue
+        if (now - date).days <= 365:
+            total += d.get('value') or 0.0
+    return total
+
+
+def extract_fundamentals(results, now=None):
+    """Raw per-ticker fundamentals from full-run results: {ticker: {field: value}}."""
+    fundamentals = {}
+    for res in results:
+        ind = res.get('indicators', {})
+        fundamentals[res['ticker']] = {
+            'lpa': ind.get('lpa', 0.0),
+            'vpa': ind.get('vpa', 0.0),
+            'dividendos_12m': round(trailing_dividends(res.get('dividends', []), now), 4),
+            'ebitda': ind.get('ebitda', 0.0),
+            'divida_liquida': ind.get('divida_liquida', 0.0),
+            'numero_papeis': ind.get('numero_papeis', 0.0),
+        }
+    return fundamentals
+
+
+def load_fundamentals(path=FUNDAMENTALS_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_fundamentals(fundamentals, path=FUNDAMENTALS_FILE):
+    write_json(fundamentals, path)
+
+
+def compute_ratios(fundamentals, prices):
+    """
+    Vectorized ratio computation for all tickers.
+
+    `fundamentals` is a DataFrame indexed by ticker with FUNDAMENTAL_FIELDS,
+    `prices` a Series indexed by ticker. Ratios whose inputs are missing or
+    non-positive come back as NaN so callers can keep the previous value.
+    """
+    f = fundamentals.reindex(columns=FUNDAMENTAL_FIELDS).astype(float)
+    price = prices.reindex(f.index).astype(float).where(lambda p: p > 0).to_numpy()
+
+    def positive(col):
+        values = f[col].to_numpy()
+        return np.where(values > 0, values, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        market_cap = price * positive('numero_papeis')
+        enterprise_value = market_cap + np.nan_to_num(f['divida_liquida'].to_numpy())
+        ratios = pd.DataFrame({
+            'pl': price / positive('lpa'),
+            'pvp': price / positive('vpa'),
+            'dy': positive('dividendos_12m') / price * 100,
+            'p_ebitda': enterprise_value / positive('ebitda'),
+            'market_cap': market_cap,
+        }, index=f.index)
+    return ratios.round(2)
+
+
+def apply_ratios(results, fundamentals, prices=None):
+    """Patch price and ratio indicators in place; `prices` defaults to each asset's current price."""
+    if not results or not fundamentals:
+        return results
+    tickers = [res['ticker'] for res in results]
+    prices = prices or {}
+    price_series = pd.Series({t: prices.get(t, res['price']) for t, res in zip(tickers, results)})
+    frame = pd.DataFrame.from_dict(fundamentals, orient='index').reindex(tickers)
+    ratios = compute_ratios(frame, price_series)
+
+    for res, (ticker, row) in zip(results, ratios.iterrows()):
+        if prices.get(ticker):
+            res['price'] = round(float(prices[ticker]), 2)
+        ind = res['indicators']
+        for field in RATIO_FIELDS:
+            if pd.notna(row[field]):
+                ind[field] = float(row[field])
+    return results
@@ -1,16 +1,21 @@
 import requests
 from bs4 import BeautifulSoup
-import json
 import os
 import time
 from fake_useragent import UserAgent
+from numeric import parse_number
+from universe import load_universe
+from writer import write_json_array
 
-# List of assets to track (Stocks and FIIs)
+# Fallback when there is no cached B3 universe (see universe.py)
 ASSETS = ['PETR4', 'VALE3', 'ITUB4', 'BBAS3', 'WEGE3', 'MXRF11', 'HGLG11', 'KNCR11', 'XPML11', 'BCFF11']
 
+# Universe types with a page under /acoes/ or /fiis/; BDRs, ETFs and units have none
+PAGE_TYPES = ('acao', 'fii')
+
 BASE_URL = "https://investidor10.com.br"
 
-def get_asset_data(ticker):
+def get_asset_data(ticker, listed_type=None):
     ua = UserAgent()
     headers = {'User-Agent': ua.random}
     
@@ -19,10 +24,16 @@ def get_asset_data(ticker):
     url_fiis = f"{BASE_URL}/fiis/{ticker.lower()}/"
     
     type_asset = 'acao'
-    print(f"Requesting {url_acoes}...")
-    response = requests.get(url_acoes, headers=headers)
+    if listed_type == 'fii':
+        # Known FII: skip the /acoes/ probe
+        print(f"Requesting {url_fiis}...")
+        response = requests.get(url_fiis, headers=headers)
+        type_asset = 'fii'
+    else:
+        print(f"Requesting {url_acoes}...")
+        response = requests.get(url_acoes, headers=headers)
     
-    if response.status_code != 200:
+    if response.status_code != 200 and type_asset == 'acao':
         print(f"Requesting {url_fiis}...")
         response = requests.get(url_fiis, headers=headers)
         type_asset = 'fii'
@@ -59,7 +70,7 @@ def get_asset_data(ticker):
         # Dividend Yield (DY): div._card.dy div._card-body span.value
         dy_elem = soup.select_one('div._card.dy div._card-body span.value')
         if dy_elem:
-            data['dy'] = _parse_float(dy_elem.text.replace('%', ''))
+            data['dy'] = _parse_float(dy_elem.text)
             
         # P/L and P/VP are inside div._card.val
         # Structure:
@@ -113,32 +124,28 @@ def get_asset_data(ticker):
     return data
 
 def _parse_float(text):
-    try:
-        # Brazilian format: 1.234,56 -> 1234.56
-        clean = text.replace('.', '').replace(',', '.').strip()
-        return float(clean)
-    except:
-        return 0.0
+    # Brazilian format: 1.234,56 -> 1234.56
+    return parse_number(text)
 
 def main():
     results = []
     print("Starting scraping...")
     
-    for asset in ASSETS:
+    universe = load_universe()
+    assets = [t for t, entry in universe.items() if entry.get('type') in PAGE_TYPES] or ASSETS
+    for asset in assets:
         print(f"Fetching {asset}...")
-        data = get_asset_data(asset)
+        data = get_asset_data(asset, universe.get(asset, {}).get('type'))
         if data:
             results.append(data)
         time.sleep(1) # Respectful delay
         
-    # Ensure directory exists
     output_dir = os.path.join(os.path.dirname(__file__), '..', 'public', 'data')
-    os.makedirs(output_dir, exist_ok=True)
-    
-    output_file = os.path.join(output_dir, 'investments.json')
+    # Kept apart from investments.json, which is the fetch_investments dataset
+    output_file = os.path.join(output_dir, 'investidor10.json')
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    # Temp file + fsync + rename (writer.py creates the directory), never a truncated file
+    write_json_array(results, output_file)
         
     print(f"Done! Data saved to {output_file}")
 
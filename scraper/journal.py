@@ -0,0 +1,75 @@
+import json
+import os
+from datetime import datetime, timezone
+
+# Append-only checkpoint journal for scraper runs. Every finished ticker is
+# written as one JSON line and fsynced, so a crash or a job timeout loses at
+# most the ticker in flight and `--resume` can pick up where the run stopped.
+# A journal belongs to a run, not a date: it stays open for resuming until the
+# run finishes and finish_journal() marks it done, however many days later.
+
+JOURNAL_DIR = os.path.join(os.path.dirname(__file__), '.journal')
+DONE_SUFFIX = '.done.ndjson'
+
+
+def new_journal_path(directory=JOURNAL_DIR):
+    """Journal for a new run, named by its UTC start time."""
+    return os.path.join(directory, f"run-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.ndjson")
+
+
+def unfinished_journal(directory=JOURNAL_DIR):
+    """Path of the newest journal whose run never finished, or None."""
+    if not os.path.isdir(directory):
+        return None
+    pending = sorted(name for name in os.listdir(directory)
+                     if name.startswith('run-') and name.endswith('.ndjson') and not name.endswith(DONE_SUFFIX))
+    return os.path.join(directory, pending[-1]) if pending else None
+
+
+def finish_journal(path):
+    """Mark a run as finished, so the next run starts a new journal."""
+    if os.path.exists(path):
+        os.replace(path, path[:-len('.ndjson')] + DONE_SUFFIX)
+
+
+def read_journal(path):
+    """{ticker: record} for every complete line; a torn last line is ignored."""
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            records[record['ticker']] = record
+    return records
+
+
+def open_journal(path, resume=False):
+    """Open the journal for appending; without `resume` any previous content is discarded."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    journal = open(path, 'a' if resume else 'w', encoding='utf-8')
+    if resume and journal.tell() > 0:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                # Terminate a line torn by a crash so the next record starts clean
+                journal.write('\n')
+    return journal
+
+
+def append_record(journal, record):
+    journal.write(json.dumps(record, ensure_ascii=False) + '\n')
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+def prune_journals(keep=3, directory=JOURNAL_DIR):
+    """Delete all but the `keep` most recent finished journals; unfinished ones are kept for resuming."""
+    if not os.path.isdir(directory):
+        return
+    journals = sorted(name for name in os.listdir(directory) if name.startswith('run-') and name.endswith(DONE_SUFFIX))
+    for name in journals[:-keep] if keep else journals:
+        os.remove(os.path.join(directory, name))
@@ -0,0 +1,175 @@
+import re
+import math
+import time
+import numpy as np
+import pandas as pd
+
+# Single place to turn scraped strings ("R$ 1.234,56", "12,5%", "1.2B",
+# "(3,40)") into floats. Both scrapers call this for every field of every
+# page, so patterns are compiled once and the scalar and pandas paths share
+# the exact same rules.
+
+PT_BR = 'pt_BR'
+EN_US = 'en_US'
+
+# Multipliers accepted after the number (case-insensitive)
+SUFFIXES = {
+    '': 1.0,
+    'k': 1e3, 'mil': 1e3,
+    'm': 1e6, 'mi': 1e6, 'mm': 1e6, 'milhao': 1e6, 'milhoes': 1e6,
+    'b': 1e9, 'bi': 1e9, 'bilhao': 1e9, 'bilhoes': 1e9,
+    't': 1e12, 'tri': 1e12, 'trilhao': 1e12, 'trilhoes': 1e12,
+}
+
+_NOISE_RE = re.compile(r'R\$|US\$|\$|%|\s| ')
+_ACCENTS = str.maketrans('ãõç', 'aoc')
+_NUMBER_RE = re.compile(r'^([0-9][0-9.,]*)([a-z]*)$')
+# "1.234" / "12.345.678" in pt-BR (and "1,234" in en-US) are thousands, not decimals
+_PT_THOUSANDS_RE = re.compile(r'^\d{1,3}(\.\d{3})+$')
+_EN_THOUSANDS_RE = re.compile(r'^\d{1,3}(,\d{3})+$')
+
+
+def _normalize_digits(digits, locale):
+    """Convert a bare '1.234,56'-style string into a float-parsable one."""
+    if locale == EN_US:
+        if '.' not in digits and _EN_THOUSANDS_RE.match(digits):
+            return digits.replace(',', '')
+        if '.' in digits and ',' in digits and digits.rfind(',') > digits.rfind('.'):
+            # Mixed input with a pt-BR layout ("1.234,56")
+            return digits.replace('.', '').replace(',', '.')
+        return digits.replace(',', '')
+
+    if ',' in digits:
+        if '.' in digits and digits.rfind('.') > digits.rfind(','):
+            # Mixed input with an en-US layout ("1,234.56")
+            return digits.replace(',', '')
+        return digits.replace('.', '').replace(',', '.')
+    if digits.count('.') > 1 or _PT_THOUSANDS_RE.match(digits):
+        return digits.replace('.', '')
+    return digits
+
+
+def parse_number(value, locale=PT_BR, default=0.0):
+    """
+    Parse a scraped numeric value into a float.
+
+    Handles pt-BR ('1.234,56') and en-US ('1,234.56') separators, 'R$'/'$'
+    and '%' markers, K/M/B/T (and mil/mi/bi/tri) suffixes and negatives
+    written as '-1,5' or '(1,5)'. Percentages keep their scale, so '12,5%'
+    returns 12.5. Anything unparseable returns `default`.
+    """
+    if value is None or isinstance(value, bool):
+        return default
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        value = float(value)
+        return default if math.isnan(value) else value
+
+    text = _NOISE_RE.sub('', str(value)).lower().translate(_ACCENTS)
+    negative = False
+    if text.startswith('(') and text.endswith(')'):
+        negative = True
+        text = text[1:-1]
+    if text[:1] in ('-', '−'):
+        negative = not negative
+        text = text[1:]
+    elif text[:1] == '+':
+        text = text[1:]
+
+    match = _NUMBER_RE.match(text)
+    if not match or match.group(2) not in SUFFIXES:
+        return default
+    try:
+        number = float(_normalize_digits(match.group(1), locale))
+    except ValueError:
+        return default
+    number *= SUFFIXES[match.group(2)]
+    return -number if negative else number
+
+
+def parse_series(series, locale=PT_BR, default=0.0):
+    """
+    Vectorized `parse_number` for a pandas Series of scraped values.
+
+    Produces the same result as mapping `parse_number` over the series, but
+    uses pandas string methods so whole columns parse in a few passes.
+    Scraped columns repeat a lot, so only the distinct values are parsed.
+    """
+    series = pd.Series(series)
+    # factorize treats True/1 and False/0 as the same value, but booleans are
+    # never numbers to parse_number; blank them so they fall back to default
+    keys = series
+    if series.dtype == bool:
+        keys = pd.Series(np.nan, index=series.index)
+    elif series.dtype == object:
+        keys = series.where(~series.map(lambda v: isinstance(v, (bool, np.bool_))))
+    codes, uniques = pd.factorize(keys, use_na_sentinel=True)
+    parsed = _parse_unique(pd.Series(uniques, dtype=object), locale, default).to_numpy()
+    result = np.full(len(series), default, dtype=float)
+    found = codes >= 0
+    result[found] = parsed[codes[found]]
+    return pd.Series(result, index=series.index)
+
+
+def _parse_unique(series, locale, default):
+    numeric = pd.to_numeric(series, errors='coerce')
+    is_numeric = series.map(lambda v: isinstance(v, (int, float, np.integer, np.floating))
+                            and not isinstance(v, bool))
+
+    text = (series.where(~is_numeric & series.notna(), '').astype(str)
+            .str.replace(_NOISE_RE, '', regex=True)
+            .str.lower()
+            .str.translate(_ACCENTS))
+
+    parens = text.str.startswith('(') & text.str.endswith(')')
+    text = text.where(~parens, text.str[1:-1])
+    minus = text.str[:1].isin(['-', '−'])
+    plus = text.str[:1] == '+'
+    text = text.where(~(minus | plus), text.str[1:])
+    negative = parens ^ minus
+
+    parts = text.str.extract(_NUMBER_RE)
+    digits = parts[0].fillna('')
+    multiplier = parts[1].map(SUFFIXES)
+
+    has_comma = digits.str.contains(',', regex=False)
+    has_dot = digits.str.contains('.', regex=False)
+    comma_last = digits.str.rfind(',') > digits.str.rfind('.')
+    strip_dots = digits.str.replace('.', '', regex=False)
+    strip_commas = digits.str.replace(',', '', regex=False)
+    pt_layout = strip_dots.str.replace(',', '.', regex=False)
+
+    if locale == EN_US:
+        normalized = strip_commas.where(~(has_comma & has_dot & comma_last), pt_layout)
+    else:
+        dotted_thousands = (digits.str.count(r'\.') > 1) | digits.str.match(_PT_THOUSANDS_RE)
+        normalized = digits.where(~(~has_comma & dotted_thousands), strip_dots)
+        normalized = normalized.where(~has_comma, pt_layout)
+        normalized = normalized.where(~(has_comma & has_dot & ~comma_last), strip_commas)
+
+    parsed = pd.to_numeric(normalized, errors='coerce') * multiplier
+    parsed = parsed.where(~negative, -parsed)
+    parsed = parsed.where(~is_numeric, numeric)
+    return parsed.fillna(default).astype(float)
+
+
+def benchmark(n=200_000):
+    """Print parse throughput for the scalar and vectorized paths."""
+    samples = ['R$ 1.234,56', '12,5%', '1.2B', '(3,40)', '-0,75', '500M', '4,50', 'N/A', '2.345.678', '1,1 mi']
+    values = (samples * (n // len(samples) + 1))[:n]
+
+    start = time.perf_counter()
+    for v in values:
+        parse_number(v)
+    scalar = time.perf_counter() - start
+
+    series = pd.Series(values)
+    start = time.perf_counter()
+    parse_series(series)
+    vectorized = time.perf_counter() - start
+
+    print(f"parse_number: {n / scalar:,.0f} values/s ({scalar:.2f}s)")
+    print(f"parse_series: {n / vectorized:,.0f} values/s ({vectorized:.2f}s)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,237 @@
+import json
+import time
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from history import returns_matrix
+
+# Monte Carlo version of RetirementSimulator.tsx. Instead of a fixed annual
+# rate, every simulated year replays a random 12-month window of real monthly
+# total returns from the scraper's 10-year histories (block bootstrap, so
+# within-year momentum and crashes are kept). Each window is reduced to two
+# factors up front: its growth and the year-end value of one unit contributed
+# at the end of every month. A whole run is then a gather plus a cumprod and a
+# cumsum over a (paths x years) array.
+
+PATHS = 100_000
+YEARS = 40
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+# Inputs of RetirementSimulator.tsx, plus the bootstrap settings
+DEFAULTS = {
+    'current_patrimony': 0.0,
+    'monthly_contribution': 1000.0,
+    'desired_income': 5000.0,
+    'annual_inflation': 4.0,
+    'adjust_contribution_for_inflation': False,
+    'withdrawal_rate': 4.0,     # % a year the final patrimony must sustain the desired income at
+    'years': YEARS,
+    'paths': PATHS,
+    'tickers': None,            # None = every ticker in the returns store
+    'weights': None,            # None = equal weight
+    'seed': None,
+}
+
+
+def portfolio_returns(values, weights=None):
+    """
+    Monthly return series of a portfolio from a (months x tickers) matrix.
+    Each month averages the tickers that have data, renormalizing the weights,
+    and months where none do are dropped.
+    """
+    weights = np.ones(values.shape[1]) if weights is None else np.asarray(weights, dtype=float)
+    present = ~np.isnan(values)
+    total = present @ weights
+    series = np.nan_to_num(values) @ weights
+    keep = total > 0
+    return series[keep] / total[keep]
+
+
+def yearly_blocks(monthly):
+    """
+    (growth, accumulation) for every 12-month window of the series: the
+    window's compounded growth and the year-end value of 1 contributed at the
+    end of each of its months.
+    """
+    windows = sliding_window_view(1 + np.asarray(monthly, dtype=float), 12)
+    # tail[:, m] = growth from the start of month m to the end of the window
+    tail = np.cumprod(windows[:, ::-1], axis=1)[:, ::-1]
+    return tail[:, 0], 1 + tail[:, 1:].sum(axis=1)
+
+
+def simulate(growth, accumulation, current_patrimony=0.0, monthly_contribution=1000.0,
+             annual_inflation=4.0, adjust_contribution_for_inflation=False,
+             years=YEARS, paths=PATHS, rng=None):
+    """
+    Nominal patrimony at the end of each year, shaped (paths, years + 1) with
+    column 0 the starting patrimony. Balance follows B_y = B_{y-1} G_y + c_y A_y,
+    solved in closed form as P_y (B_0 + sum c_k A_k / P_k) with P the
+    cumulative growth.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    draws = rng.integers(0, len(growth), size=(paths, years))
+    g = growth[draws]
+    cumulative = np.cumprod(g, axis=1)
+    contributions = np.full(years, float(monthly_contribution))
+    if adjust_contribution_for_inflation:
+        contributions *= (1 + annual_inflation / 100) ** np.arange(years)
+
+    balance = np.empty((paths, years + 1))
+    balance[:, 0] = current_patrimony
+    balance[:, 1:] = cumulative * (current_patrimony + np.cumsum(contributions * accumulation[draws] / cumulative, axis=1))
+    return balance
+
+
+def summarize(balance, scenario):
+    """Percentile trajectories (nominal and real), invested capital and success probability per year."""
+    years = balance.shape[1] - 1
+    inflation = (1 + scenario['annual_inflation'] / 100) ** np.arange(years + 1)
+    real = balance / inflation
+    target = scenario['desired_income'] * 12 / (scenario['withdrawal_rate'] / 100)
+
+    contributions = np.full(years, float(scenario['monthly_contribution'])) * 12
+    if scenario['adjust_contribution_for_inflation']:
+        contributions *= inflation[:-1]
+    invested = scenario['current_patrimony'] + np.concatenate([[0.0], np.cumsum(contributions)])
+
+    def bands(values):
+        return {f"p{p}": row.round(2).tolist() for p, row in zip(PERCENTILES, np.percentile(values, PERCENTILES, axis=0))}
+
+    success = (real >= target).mean(axis=0)
+    reached = np.flatnonzero(success >= 0.5)
+    return {
+        'years': list(range(years + 1)),
+        'nominal': bands(balance),
+        'real': bands(real),
+        'invested': invested.round(2).tolist(),
+        'target_real': round(float(target), 2),
+        'success_probability': success.round(4).tolist(),
+        'median_freedom_year': int(reached[0]) if len(reached) else None,
+    }
+
+
+class Simulator:
+    """
+    Holds the aligned returns matrix and caches the yearly blocks per
+    portfolio, so batches and the local endpoint pay the load once.
+    """
+
+    def __init__(self, months=None, tickers=None, values=None):
+        if values is None:
+            months, tickers, values = returns_matrix()
+        self.months, self.tickers, self.values = months, tickers, values
+        self.column = {t: j for j, t in enumerate(tickers)}
+        self._blocks = {}
+
+    def blocks(self, tickers=None, weights=None):
+        key = (tuple(tickers) if tickers else None, tuple(weights) if weights else None)
+        if key not in self._blocks:
+            if tickers:
+                columns = [self.column[t] for t in tickers if t in self.column]
+                if not columns:
+                    raise ValueError(f"No return history for {tickers}")
+                if weights:
+                    weights = [w for t, w in zip(tickers, weights) if t in self.column]
+                values = self.values[:, columns]
+            else:
+                values = self.values
+            monthly = portfolio_returns(values, weights)
+            if len(monthly) < 12:
+                raise ValueError("At least 12 months of returns are needed")
+            self._blocks[key] = yearly_blocks(monthly)
+        return self._blocks[key]
+
+    def run(self, scenario=None):
+        scenario = {**DEFAULTS, **(scenario or {})}
+        growth, accumulation = self.blocks(scenario['tickers'], scenario['weights'])
+        balance = simulate(
+            growth, accumulation,
+            scenario['current_patrimony'], scenario['monthly_contribution'],
+            scenario['annual_inflation'], scenario['adjust_contribution_for_inflation'],
+            int(scenario['years']), int(scenario['paths']),
+            np.random.default_rng(scenario['seed']),
+        )
+        return {**summarize(balance, scenario), 'windows': int(len(growth))}
+
+    def run_batch(self, scenarios):
+        """{scenario id: result}; scenarios are dicts with an optional 'id' and DEFAULTS overrides."""
+        return {str(s.get('id', i)): self.run({k: v for k, v in s.items() if k != 'id'})
+                for i, s in enumerate(scenarios)}
+
+
+def serve(simulator, port=8765, host='127.0.0.1'):
+    """Local endpoint: POST a scenario (or a list of them) as JSON to /simulate."""
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != '/simulate':
+                self.send_error(404)
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                result = simulator.run_batch(body) if isinstance(body, list) else simulator.run(body)
+                payload, status = json.dumps(result).encode(), 200
+            except (ValueError, TypeError, KeyError) as e:
+                payload, status = json.dumps({'error': str(e)}).encode(), 400
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    print(f"Serving Monte Carlo simulations on http://{host}:{port}/simulate "
+          f"({len(simulator.tickers)} tickers, {len(simulator.months)} months)")
+    HTTPServer((host, port), Handler).serve_forever()
+
+
+def benchmark(paths=PATHS, years=YEARS, repeat=3):
+    """Time one full simulation; uses synthetic returns when the store is empty."""
+    simulator = Simulator()
+    if not simulator.tickers:
+        rng = np.random.default_rng(0)
+        simulator = Simulator([], [f"T{i}" for i in range(50)], rng.normal(0.01, 0.07, size=(120, 50)))
+        print("Returns store is empty, using 120 months of synthetic returns")
+
+    start = time.perf_counter()
+    simulator.blocks()
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = simulator.run({'paths': paths, 'years': years, 'seed': 0})
+    elapsed = (time.perf_counter() - start) / repeat
+
+    print(f"{paths} paths x {years} years: blocks {built * 1000:.1f} ms, simulation {elapsed * 1000:.0f} ms "
+          f"({paths * years / elapsed / 1e6:.1f}M path-years/s)")
+    print(f"Median real patrimony after {years} years: R$ {result['real']['p50'][-1]:,.0f}; "
+          f"success probability {result['success_probability'][-1] * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    import argparse
+    from writer import write_json
+
+    parser = argparse.ArgumentParser(description="Monte Carlo retirement simulation over historical returns")
+    parser.add_argument("--benchmark", type=int, metavar="PATHS", help="Time a run with PATHS paths")
+    parser.add_argument("--batch", metavar="FILE", help="JSON list of scenarios to simulate")
+    parser.add_argument("--output", help="Write batch results to this JSON file instead of stdout")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Serve simulations on localhost")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+    elif args.serve:
+        serve(Simulator(), args.serve)
+    elif args.batch:
+        with open(args.batch, 'r', encoding='utf-8') as f:
+            results = Simulator().run_batch(json.load(f))
+        if args.output:
+            write_json(results, args.output)
+        else:
+            print(json.dumps(results, indent=2))
+    else:
+        result = Simulator().run()
+        for year in range(0, len(result['years']), 5):
+            print(f"Year {year:2d}: median R$ {result['real']['p50'][year]:>14,.0f} "
+                  f"(p10 {result['real']['p10'][year]:>14,.0f}, p90 {result['real']['p90'][year]:>14,.0f}) "
+                  f"success {result['success_probability'][year] * 100:5.1f}%")
@@ -0,0 +1,160 @@
+import os
+import argparse
+import requests
+import numpy as np
+import pandas as pd
+from collections import Counter
+from datetime import datetime
+
+# Decides which tickers get a full fetch in a run. Tickers are ranked by how
+# many users hold them, liquidity (liquidez_media_diaria) and staleness, and
+# each tier gets a share of the request budget, so the upstream rate limit is
+# spent on the assets people actually look at.
+
+SUPABASE_URL = os.environ.get('SUPABASE_URL') or os.environ.get('VITE_SUPABASE_URL')
+SUPABASE_KEY = os.environ.get('SUPABASE_SERVICE_ROLE_KEY')
+
+# Tier name -> max age in days before a refresh is due, share of the budget
+TIERS = {
+    'hot': {'max_age': 1, 'share': 0.6},
+    'warm': {'max_age': 3, 'share': 0.3},
+    'cold': {'max_age': 7, 'share': 0.1},
+}
+HOT_LIQUIDITY_RANK = 100       # Top-N most liquid tickers are hot even if nobody holds them
+WARM_LIQUIDITY = 1_000_000.0   # R$/day
+# Runs are daily but a ticker is fetched somewhere inside a run of a few
+# hours, so at the next run it can be a bit under max_age days old. Ages within
+# DUE_SLACK days of max_age count as due; RUN_DAYS is the run length simulate() assumes.
+DUE_SLACK = 0.5
+RUN_DAYS = 220 / 1440
+
+
+SUPABASE_PAGE = 1000  # PostgREST's default cap on rows per response
+
+
+def fetch_rows(table, select, timeout=60):
+    """
+    Every row of a Supabase table (service role key required). PostgREST
+    truncates a response at its max-rows setting, so rows are read in pages
+    ordered by id until a short page comes back.
+    """
+    headers = {'apikey': SUPABASE_KEY, 'Authorization': f"Bearer {SUPABASE_KEY}"}
+    rows = []
+    while True:
+        response = requests.get(f"{SUPABASE_URL}/rest/v1/{table}",
+                                params={'select': select, 'order': 'id', 'limit': SUPABASE_PAGE, 'offset': len(rows)},
+                                headers=headers, timeout=timeout)
+        response.raise_for_status()
+        page = response.json()
+        rows.extend(page)
+        if len(page) < SUPABASE_PAGE:
+            return rows
+
+
+def load_holdings():
+    """{symbol: holders} from Supabase wallet_assets, or {} without service credentials."""
+    if not (SUPABASE_URL and SUPABASE_KEY):
+        return {}
+    try:
+        rows = fetch_rows('wallet_assets', 'symbol', timeout=30)
+        return dict(Counter(row['symbol'].upper().replace('.SA', '') for row in rows))
+    except (requests.RequestException, ValueError, KeyError) as e:
+        print(f"Could not load holdings: {e}")
+        return {}
+
+
+def build_table(tickers, holdings=None, liquidity=None, last_updated=None, now=None):
+    """One row per ticker with holders, liquidity, age (days) and tier."""
+    now = now or datetime.now()
+    holdings, liquidity, last_updated = holdings or {}, liquidity or {}, last_updated or {}
+
+    table = pd.DataFrame(index=pd.Index(list(dict.fromkeys(tickers)), name='ticker'))
+    table['holders'] = [holdings.get(t, 0) for t in table.index]
+    table['liquidity'] = [float(liquidity.get(t) or 0.0) for t in table.index]
+    updated = pd.to_datetime(pd.Series([last_updated.get(t) for t in table.index], index=table.index), errors='coerce')
+    table['age'] = ((now - updated).dt.total_seconds() / 86400).fillna(np.inf).to_numpy()
+
+    liquidity_rank = table['liquidity'].rank(ascending=False, method='first')
+    hot = (table['holders'] > 0) | ((liquidity_rank <= HOT_LIQUIDITY_RANK) & (table['liquidity'] > 0))
+    warm = ~hot & (table['liquidity'] >= WARM_LIQUIDITY)
+    table['tier'] = np.select([hot, warm], ['hot', 'warm'], 'cold')
+    table['max_age'] = table['tier'].map(lambda t: TIERS[t]['max_age'])
+    return table
+
+
+def is_due(table):
+    """Tickers whose refresh is due this run: age >= max_age, give or take DUE_SLACK."""
+    return table['age'] >= table['max_age'] - DUE_SLACK
+
+
+def plan(table, budget):
+    """
+    Tickers to fetch this run, at most `budget`.
+
+    Within a tier, due tickers (see is_due) go first, most overdue, most
+    held and most liquid first. Budget a tier can't use flows to the next.
+    """
+    table = table.assign(overdue=table['age'] / table['max_age'])
+    selected = []
+    carry = 0
+    due_mask = is_due(table)
+    for tier, config in TIERS.items():
+        due = table[(table['tier'] == tier) & due_mask]
+        due = due.sort_values(['overdue', 'holders', 'liquidity'], ascending=False)
+        quota = int(round(budget * config['share'])) + carry
+        picked = due.index[:quota].tolist()
+        selected.extend(picked)
+        carry = quota - len(picked)
+
+    # Leftover budget refreshes the oldest not-yet-due tickers, hot tiers first
+    remaining = budget - len(selected)
+    if remaining > 0:
+        rest = table.drop(index=selected)
+        rest = rest.assign(tier_order=rest['tier'].map({t: i for i, t in enumerate(TIERS)}))
+        rest = rest.sort_values(['tier_order', 'overdue'], ascending=[True, False])
+        selected.extend(rest.index[:remaining].tolist())
+    return selected[:budget]
+
+
+def simulate(table, budget, days=14):
+    """
+    Run `plan` once a day for `days` days and report, per tier, the share of
+    tickers within their max age (coverage) and the mean/oldest age at the
+    end. Picked tickers are fetched one after another through a run of
+    RUN_DAYS, so at the next run they are slightly under a day old, as in
+    production.
+    """
+    table = table.copy()
+    for _ in range(days):
+        picked = plan(table, budget)
+        table.loc[picked, 'age'] = -np.linspace(0, RUN_DAYS, len(picked))
+        table['age'] += 1
+
+    table['fresh'] = table['age'] <= table['max_age']
+    report = table.groupby('tier').agg(tickers=('age', 'size'), coverage=('fresh', 'mean'),
+                                       mean_age=('age', 'mean'), oldest=('age', 'max'))
+    report['coverage'] = (report['coverage'] * 100).round(1)
+    return report.reindex([t for t in TIERS if t in report.index]).round(2)
+
+
+if __name__ == "__main__":
+    import json
+    from fetch_investments import OUTPUT_FILE
+    from universe import load_universe
+
+    parser = argparse.ArgumentParser(description="Simulate fetch scheduling under a request budget")
+    parser.add_argument("--budget", type=int, default=300, help="Full fetches per run")
+    parser.add_argument("--days", type=int, default=14, help="Runs to simulate (one per day)")
+    args = parser.parse_args()
+
+    with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    tickers = list(load_universe()) + [res['ticker'] for res in results]
+    table = build_table(
+        tickers,
+        holdings=load_holdings(),
+        liquidity={res['ticker']: res['indicators'].get('liquidez_media_diaria') for res in results},
+        last_updated={res['ticker']: res.get('updated_at') for res in results},
+    )
+    print(f"{len(table)} tickers, budget {args.budget}/run, {args.days} runs")
+    print(simulate(table, args.budget, args.days).to_string())
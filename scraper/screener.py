@@ -0,0 +1,168 @@
+import re
+import operator
+import os
+import numpy as np
+import pandas as pd
+from writer import write_json
+
+# Cross-sectional screener over the investments dataset. Assets are loaded
+# into a ticker-indexed columnar table once; every criterion is a vectorized
+# column predicate, and the preset screens are published as a side file so
+# clients read ready-made results instead of scanning investments.json.
+
+SCREENS_FILE = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'screens.json')
+
+OPERATORS = {
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+    '==': operator.eq, '!=': operator.ne,
+}
+TEXT_COLUMNS = ['type', 'segment', 'name']
+
+# name -> criteria, sort column (desc unless prefixed with '-'), size
+SCREENS = {
+    'dividendos_descontados': {
+        'description': 'DY acima de 8%, P/VP abaixo de 1 e dívida controlada, por ROE',
+        'criteria': 'dy > 8 and pvp < 1 and divida_liquida_ebitda < 2',
+        'sort': 'roe',
+    },
+    'qualidade': {
+        'description': 'ROE e margem líquida altos com alavancagem baixa',
+        'criteria': 'type == acao and roe > 15 and margem_liquida > 10 and divida_liquida_ebitda < 2',
+        'sort': 'roe',
+    },
+    'fiis_com_desconto': {
+        'description': 'FIIs negociados abaixo do valor patrimonial, por DY',
+        'criteria': 'type == fii and pvp < 0.95 and dy > 8',
+        'sort': 'dy',
+    },
+    'maiores_dividendos': {
+        'description': 'Maiores dividend yields',
+        'criteria': 'dy > 0',
+        'sort': 'dy',
+    },
+    'menor_pl': {
+        'description': 'Ações lucrativas com menor P/L',
+        'criteria': 'type == acao and pl > 0',
+        'sort': '-pl',
+    },
+}
+SCREEN_SIZE = 20
+
+_CRITERION_RE = re.compile(r'^\s*(\w+)\s*(>=|<=|==|!=|>|<)\s*(.+?)\s*$')
+
+
+def load_table(results):
+    """
+    Ticker-indexed DataFrame with price, type, segment, name and every
+    indicator as a float column. The scraper writes 0.0 for unavailable
+    indicators, so zeros become NaN and never satisfy a numeric criterion.
+    """
+    rows = {}
+    for res in results:
+        row = {'price': res.get('price'), **res.get('indicators', {})}
+        row.update({col: res.get(col) for col in TEXT_COLUMNS})
+        rows[res['ticker']] = row
+    table = pd.DataFrame.from_dict(rows, orient='index')
+    table.index.name = 'ticker'
+    numeric = table.columns.difference(TEXT_COLUMNS)
+    table[numeric] = table[numeric].apply(pd.to_numeric, errors='coerce').replace(0.0, np.nan)
+    for col in TEXT_COLUMNS:
+        if col in table:
+            table[col] = table[col].astype('category')
+    return table
+
+
+def parse_criteria(text):
+    """'dy > 8 and pvp < 1' -> [('dy', '>', 8.0), ('pvp', '<', 1.0)]."""
+    criteria = []
+    for part in re.split(r'\s+and\s+', text.strip(), flags=re.IGNORECASE):
+        if not part:
+            continue
+        match = _CRITERION_RE.match(part)
+        if not match:
+            raise ValueError(f"Invalid criterion: {part!r}")
+        field, op, value = match.groups()
+        try:
+            value = float(value)
+        except ValueError:
+            value = value.strip('\'"')
+        criteria.append((field, op, value))
+    return criteria
+
+
+def mask(table, criteria):
+    """Boolean Series: rows satisfying every (field, op, value) criterion."""
+    if isinstance(criteria, str):
+        criteria = parse_criteria(criteria)
+    result = np.ones(len(table), dtype=bool)
+    for field, op, value in criteria:
+        if field not in table:
+            raise KeyError(f"Unknown field: {field}")
+        column = table[field]
+        if isinstance(value, str):
+            column = column.astype(str)
+        result &= OPERATORS[op](column, value).fillna(False).to_numpy(dtype=bool)
+    return pd.Series(result, index=table.index)
+
+
+def screen(table, criteria, sort=None, limit=None):
+    """Filter by `criteria` and rank by `sort` (descending; '-col' for ascending)."""
+    selected = table[mask(table, criteria)]
+    if sort:
+        ascending = sort.startswith('-')
+        selected = selected.sort_values(sort.lstrip('-'), ascending=ascending, na_position='last')
+    return selected.head(limit) if limit else selected
+
+
+def run_screens(table, screens=SCREENS, limit=SCREEN_SIZE):
+    """
+    Evaluate every preset screen into a JSON-ready dict. A screen over a
+    field the table doesn't have (e.g. an empty dataset) publishes no
+    results instead of failing the run.
+    """
+    published = {}
+    for name, config in screens.items():
+        criteria = parse_criteria(config['criteria'])
+        sort_field = config['sort'].lstrip('-')
+        fields = list(dict.fromkeys([f for f, _, _ in criteria if f not in TEXT_COLUMNS] + [sort_field]))
+        required = {f for f, _, _ in criteria} | {sort_field, 'name'}
+        if required.issubset(table.columns):
+            matches = int(mask(table, criteria).sum())
+            selected = screen(table, criteria, config['sort'], limit)
+        else:
+            matches, selected = 0, table.iloc[:0]
+        published[name] = {
+            'description': config['description'],
+            'criteria': config['criteria'],
+            'sort': config['sort'],
+            'matches': matches,
+            'results': [
+                {'ticker': ticker, 'name': row['name'],
+                 **{f: round(float(row[f]), 2) for f in fields if pd.notna(row[f])}}
+                for ticker, row in selected.iterrows()
+            ],
+        }
+    return published
+
+
+def publish_screens(results, path=SCREENS_FILE):
+    write_json(run_screens(load_table(results)), path)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from fetch_investments import OUTPUT_FILE
+
+    parser = argparse.ArgumentParser(description="Screen the investments dataset")
+    parser.add_argument("criteria", nargs='?', default=None, help="e.g. \"dy > 8 and pvp < 1\"")
+    parser.add_argument("--sort", default=None, help="Column to rank by, descending; --sort=-pl for ascending")
+    parser.add_argument("--limit", type=int, default=SCREEN_SIZE)
+    args = parser.parse_args()
+
+    with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+        table = load_table(json.load(f))
+    if args.criteria:
+        print(screen(table, args.criteria, args.sort, args.limit)[['name', 'price', 'dy', 'pl', 'pvp', 'roe']].to_string())
+    else:
+        print(json.dumps(run_screens(table), ensure_ascii=False, indent=2))
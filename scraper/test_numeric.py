@@ -0,0 +1,116 @@
+import os
+import sys
+import math
+
+import numpy as np
+import pandas as pd
+from hypothesis import given, settings, strategies as st
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from numeric import PT_BR, EN_US, SUFFIXES, parse_number, parse_series
+
+# Property tests for numeric.py: the vectorized parser must agree with the
+# scalar one on anything the scrapers can hand it, and formatted numbers must
+# parse back to the value they were formatted from.
+# Needs scraper/requirements-dev.txt (pytest, hypothesis); run with
+# `pytest scraper/test_numeric.py` or `python scraper/test_numeric.py`.
+
+LOCALES = st.sampled_from([PT_BR, EN_US])
+
+# Fragments seen in scraped cells, glued together in arbitrary order
+FRAGMENTS = ['0', '1', '2', '5', '9', '00', '000', '123', '.', ',', '-', '−', '+',
+             '(', ')', '%', 'R$', 'US$', '$', ' ', '\xa0', 'N/A', '--',
+             'k', 'M', 'B', 'T', 'mil', 'mi', 'bi', 'tri', 'milhões', 'bilhão', 'x']
+noisy_text = st.lists(st.sampled_from(FRAGMENTS), max_size=8).map(''.join)
+
+
+def _group(digits, sep):
+    """Insert a thousands separator every three digits from the right."""
+    head = len(digits) % 3 or 3
+    return sep.join([digits[:head]] + [digits[i:i + 3] for i in range(head, len(digits), 3)])
+
+
+@st.composite
+def formatted_numbers(draw):
+    """A (text, locale, value, tolerance) tuple as a page would render it."""
+    locale = draw(LOCALES)
+    value = draw(st.floats(min_value=-1e9, max_value=1e9, allow_nan=False))
+    decimals = draw(st.integers(min_value=0, max_value=4))
+    thousands = draw(st.booleans())
+    suffix = draw(st.sampled_from(['', 'k', 'M', 'B', 'mi', 'bi']))
+
+    scaled = value / SUFFIXES[suffix.lower()]
+    integer, _, fraction = f"{abs(scaled):.{decimals}f}".partition('.')
+    point, sep = (',', '.') if locale == PT_BR else ('.', ',')
+    if thousands:
+        integer = _group(integer, sep)
+    text = integer + (point + fraction if fraction else '') + suffix
+
+    style = draw(st.sampled_from(['plain', 'currency', 'percent']))
+    if style == 'currency':
+        text = ('R$ ' if locale == PT_BR else '$') + text
+    elif style == 'percent':
+        text += '%'
+    if value < 0:
+        text = draw(st.sampled_from(['-' + text, '(' + text + ')']))
+
+    tolerance = 0.5 * 10 ** -decimals * SUFFIXES[suffix.lower()]
+    return text, locale, value, tolerance
+
+
+scraped_values = st.one_of(
+    noisy_text,
+    formatted_numbers().map(lambda item: item[0]),
+    st.floats(allow_nan=True, allow_infinity=False),
+    st.integers(min_value=-10 ** 12, max_value=10 ** 12),
+    st.booleans(),
+    st.none(),
+)
+
+
+def _same(left, right):
+    return (math.isnan(left) and math.isnan(right)) or left == right
+
+
+@given(st.lists(scraped_values, max_size=30), LOCALES)
+@settings(max_examples=500, deadline=None)
+def test_series_matches_scalar(values, locale):
+    series = pd.Series(values, dtype=object)
+    vectorized = parse_series(series, locale=locale)
+    scalar = series.map(lambda v: parse_number(v, locale=locale))
+    assert len(vectorized) == len(series)
+    for value, left, right in zip(values, vectorized, scalar):
+        assert _same(left, right), (value, left, right)
+
+
+@given(st.lists(noisy_text, max_size=30), LOCALES, st.sampled_from([0.0, np.nan]))
+@settings(max_examples=300, deadline=None)
+def test_series_matches_scalar_default(values, locale, default):
+    series = pd.Series(values, dtype=object)
+    vectorized = parse_series(series, locale=locale, default=default)
+    scalar = series.map(lambda v: parse_number(v, locale=locale, default=default))
+    for value, left, right in zip(values, vectorized, scalar):
+        assert _same(left, right), (value, left, right)
+
+
+@given(formatted_numbers())
+@settings(max_examples=1000, deadline=None)
+def test_formatted_round_trip(item):
+    text, locale, value, tolerance = item
+    parsed = parse_number(text, locale=locale)
+    assert abs(parsed - value) <= tolerance * (1 + 1e-9) + 1e-9 * abs(value), (text, parsed, value)
+    assert _same(parse_series([text], locale=locale).iloc[0], parsed)
+
+
+@given(st.floats(allow_nan=False, allow_infinity=False), LOCALES)
+def test_numbers_pass_through(value, locale):
+    assert parse_number(value, locale=locale) == value
+    assert parse_series([value], locale=locale).iloc[0] == value
+
+
+if __name__ == "__main__":
+    test_series_matches_scalar()
+    test_series_matches_scalar_default()
+    test_formatted_round_trip()
+    test_numbers_pass_through()
+    print("numeric: all properties hold")
@@ -0,0 +1,107 @@
+import json
+import os
+import re
+from datetime import datetime
+from brapi import BrapiClient
+from writer import write_json
+
+# Ticker discovery: pulls the full B3 listing (stocks, units, FIIs, BDRs)
+# from brapi, caches it as the stored universe and reports which tickers are
+# not in the dataset yet so only those are scheduled for a full fetch.
+
+UNIVERSE_FILE = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'universe.json')
+
+# brapi listing type -> dataset type
+LISTING_TYPES = {'stock': 'acao', 'fund': 'fii', 'bdr': 'bdr'}
+
+# Regular B3 tickers: 4 letters + class digit(s). Skips fractional (F),
+# rights (1/2/9/10, 12-14) and receipt codes the scraper can't price.
+_TICKER_RE = re.compile(r'^[A-Z0-9]{4}(3|4|5|6|7|8|11|3[2-9])$')
+
+
+def classify(symbol, listing_type):
+    """Dataset asset type for a listed symbol; units are stocks trading under class 11."""
+    asset_type = LISTING_TYPES.get(listing_type, 'acao')
+    if asset_type == 'acao' and symbol.endswith('11'):
+        return 'unit'
+    return asset_type
+
+
+def fetch_listing(client=None):
+    """Current B3 listing as {ticker: {'type', 'name', 'sector', 'volume', 'close'}}, or {} if incomplete."""
+    client = client or BrapiClient()
+    listing = {}
+    for listing_type in LISTING_TYPES:
+        rows = client.list_assets(listing_type)
+        if not rows:
+            return {}
+        for row in rows:
+            symbol = (row.get('stock') or '').upper()
+            if not _TICKER_RE.match(symbol):
+                continue
+            listing[symbol] = {
+                'type': classify(symbol, listing_type),
+                'name': row.get('name') or symbol,
+                'sector': row.get('sector') or 'N/A',
+                'volume': row.get('volume') or 0,
+                'close': row.get('close') or 0.0,
+            }
+    return listing
+
+
+def traded_value(entry):
+    """Daily traded value in R$ (shares traded x last close), comparable to liquidez_media_diaria."""
+    return (entry.get('volume') or 0) * (entry.get('close') or 0.0)
+
+
+def load_universe(path=UNIVERSE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_universe(universe, path=UNIVERSE_FILE):
+    write_json(universe, path, sort_keys=True)
+
+
+def diff_universe(listing, known):
+    """Return (new, removed): listed tickers missing from `known`, and known tickers no longer listed."""
+    new = sorted(set(listing) - set(known))
+    removed = sorted(set(known) - set(listing))
+    return new, removed
+
+
+def discover(known=(), client=None):
+    """
+    Refresh the cached B3 listing and diff it against the `known` tickers
+    (the ones already in the dataset).
+
+    Returns (universe, new, removed). New tickers are ordered by traded
+    value so the most liquid ones get their first full fetch first. If the
+    listing can't be pulled, the cached universe is used and nothing is
+    reported as delisted.
+    """
+    cached = load_universe()
+    listing = fetch_listing(client)
+    if not listing:
+        print("B3 listing unavailable, using the cached universe.")
+        new, _ = diff_universe(cached, known)
+        new.sort(key=lambda t: traded_value(cached[t]), reverse=True)
+        return cached, new, []
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    for ticker, entry in listing.items():
+        entry['first_seen'] = cached.get(ticker, {}).get('first_seen', today)
+    save_universe(listing)
+
+    new, removed = diff_universe(listing, known)
+    new.sort(key=lambda t: traded_value(listing[t]), reverse=True)
+    print(f"Universe: {len(listing)} tickers ({len(new)} not fetched yet, {len(removed)} delisted)")
+    return listing, new, removed
+
+
+if __name__ == "__main__":
+    universe, new, removed = discover()
+    print(f"New: {', '.join(new[:50])}{' ...' if len(new) > 50 else ''}")
+    print(f"Removed: {', '.join(removed)}")
@@ -0,0 +1,140 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from indicators import trailing_dividends
+from writer import write_json
+
+# Fair-value estimates computed at scrape time for every ticker at once:
+# Graham number, Bazin ceiling price and Gordon growth (DDM). Inputs are
+# gathered into arrays once and every model is a NumPy expression, so missing
+# or non-positive inputs simply propagate as NaN instead of raising.
+
+VALUATIONS_FILE = os.path.join(os.path.dirname(__file__), '..', 'public', 'data', 'valuations.json')
+
+GRAHAM_MULTIPLIER = 22.5    # P/L 15 x P/VP 1.5
+BAZIN_YIELD = 0.06          # Minimum acceptable dividend yield
+BAZIN_YEARS = 6             # Complete years averaged for Bazin
+REQUIRED_RETURN = 0.12      # Discount rate for the DDM
+MAX_GROWTH = 0.05           # Cap on perpetual dividend growth
+
+
+def build_inputs(results, now=None):
+    """
+    Arrays of model inputs, one row per asset. Yearly dividends come from
+    chartData as a (tickers x BAZIN_YEARS) matrix of the last complete years,
+    with years without payments as 0.
+    """
+    now = now or datetime.now()
+    years = np.arange(now.year - BAZIN_YEARS, now.year)
+    yearly = np.zeros((len(results), BAZIN_YEARS))
+    for i, res in enumerate(results):
+        for item in res.get('chartData', []):
+            j = item.get('year', 0) - years[0]
+            if 0 <= j < BAZIN_YEARS:
+                yearly[i, j] = item.get('value') or 0.0
+
+    def indicator(name):
+        return np.array([res.get('indicators', {}).get(name) or 0.0 for res in results], dtype=float)
+
+    return {
+        'tickers': [res['ticker'] for res in results],
+        'price': np.array([res.get('price') or 0.0 for res in results], dtype=float),
+        'lpa': indicator('lpa'),
+        'vpa': indicator('vpa'),
+        'roe': indicator('roe'),
+        'payout': indicator('payout'),
+        'dividends_12m': np.array([trailing_dividends(res.get('dividends', []), now) for res in results]),
+        'yearly_dividends': yearly,
+    }
+
+
+def compute_valuations(inputs, required_return=REQUIRED_RETURN, bazin_yield=BAZIN_YIELD, max_growth=MAX_GROWTH):
+    """DataFrame indexed by ticker with fair values and upside (%) per model; NaN where inputs are missing."""
+    def positive(values):
+        return np.where(values > 0, values, np.nan)
+
+    price = positive(inputs['price'])
+    lpa, vpa = positive(inputs['lpa']), positive(inputs['vpa'])
+    yearly = inputs['yearly_dividends']
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        graham = np.sqrt(GRAHAM_MULTIPLIER * lpa * vpa)
+
+        avg_dividend = positive(yearly.mean(axis=1))
+        bazin = avg_dividend / bazin_yield
+
+        # Sustainable growth g = ROE x retention, clipped to [0, max_growth].
+        # The scraper stores a missing payout as 0, which would read as full
+        # retention (maximum growth), so an unknown payout means no growth
+        retention = np.clip(1 - positive(inputs['payout']) / 100, 0, 1)
+        growth = np.clip(inputs['roe'] / 100 * retention, 0, max_growth)
+        d0 = positive(np.where(inputs['dividends_12m'] > 0, inputs['dividends_12m'], yearly[:, -1]))
+        ddm = d0 * (1 + np.nan_to_num(growth)) / (required_return - np.nan_to_num(growth))
+
+        table = pd.DataFrame({
+            'graham': graham,
+            'bazin': bazin,
+            'ddm': ddm,
+            'ddm_growth': growth * 100,
+            'upside_graham': (graham / price - 1) * 100,
+            'upside_bazin': (bazin / price - 1) * 100,
+            'upside_ddm': (ddm / price - 1) * 100,
+        }, index=pd.Index(inputs['tickers'], name='ticker'))
+    return table.replace([np.inf, -np.inf], np.nan).round(2)
+
+
+def valuations_to_dict(table):
+    """{ticker: {model: value}} dropping models that couldn't be computed."""
+    records = table.to_dict(orient='index')
+    return {t: {k: v for k, v in row.items() if pd.notna(v)} for t, row in records.items()}
+
+
+def publish_valuations(results, path=VALUATIONS_FILE):
+    write_json(valuations_to_dict(compute_valuations(build_inputs(results))), path)
+
+
+def benchmark(n=5000, repeat=5):
+    """Time input gathering and the model step on a synthetic universe of `n` tickers."""
+    rng = np.random.default_rng(0)
+    now = datetime.now()
+    results = []
+    for i in range(n):
+        results.append({
+            'ticker': f"T{i:05d}",
+            'price': float(rng.uniform(1, 100)),
+            'indicators': {'lpa': float(rng.normal(3, 3)), 'vpa': float(rng.normal(20, 15)),
+                           'roe': float(rng.normal(12, 10)), 'payout': float(rng.uniform(0, 120))},
+            'chartData': [{'year': now.year - k, 'value': float(rng.uniform(0, 5))} for k in range(10)],
+            'dividends': [{'dateCom': f"15/{m:02d}/{now.year - 1}", 'value': float(rng.uniform(0, 1))}
+                          for m in range(1, 13, 3)],
+        })
+
+    start = time.perf_counter()
+    inputs = build_inputs(results, now)
+    gather = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        table = compute_valuations(inputs)
+    models = (time.perf_counter() - start) / repeat
+
+    print(f"{n} tickers: build_inputs {gather * 1000:.1f} ms, compute_valuations {models * 1000:.2f} ms")
+    print(table.notna().mean().mul(100).round(1).rename('% computed').to_string())
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from fetch_investments import OUTPUT_FILE
+
+    parser = argparse.ArgumentParser(description="Fair-value models for the investments dataset")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Benchmark on N synthetic tickers")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+    else:
+        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
+            print(compute_valuations(build_inputs(json.load(f))).to_string())
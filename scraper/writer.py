@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import orjson
+except ImportError:  # Falls back to the stdlib encoder
+    orjson = None
+
+# Output writers for the published datasets. Records are serialized one at a
+# time into a temp file next to the target, fsynced and renamed over it, so
+# the app never serves a half-written investments.json.
+
+
+def _dumps(obj, indent=False, sort_keys=False):
+    """Serialize to str; orjson when installed (much faster), json otherwise."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys)
+
+
+@contextmanager
+def atomic_write(path, binary=False):
+    """Yield a file that replaces `path` only if the block completes."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; the file is served publicly
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def write_json_array(records, path):
+    """Stream an iterable of records as an indented JSON array (same layout as json.dump(indent=2))."""
+    with atomic_write(path) as f:
+        f.write('[')
+        empty = True
+        for record in records:
+            f.write('\n  ' if empty else ',\n  ')
+            f.write(_dumps(record, indent=True).replace('\n', '\n  '))
+            empty = False
+        f.write(']' if empty else '\n]')
+
+
+def write_ndjson(records, path):
+    """Stream records as newline-delimited JSON for line-by-line consumers."""
+    with atomic_write(path) as f:
+        for record in records:
+            f.write(_dumps(record))
+            f.write('\n')
+
+
+def write_json(obj, path, sort_keys=False):
+    """Atomically write a single JSON document (side files like fundamentals.json)."""
+    with atomic_write(path) as f:
+        f.write(_dumps(obj, indent=True, sort_keys=sort_keys))